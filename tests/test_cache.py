@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+from dataclasses import asdict
+
+import pytest
+
+from url_to_book import cache
+from url_to_book.cache import (
+    CachedArticle,
+    get_cache_dir,
+    hash_content,
+    load_cached_article,
+    store_cached_article,
+    write_cache_file,
+)
+from url_to_book.extractor import ContentBlock, ExtractedArticle, _article_from_dict
+
+
+def _article(url):
+    return ExtractedArticle(
+        title="Заголовок",
+        content=[
+            ContentBlock(type="heading", text="Heading", html="Heading", level=2),
+            ContentBlock(type="paragraph", text="Paragraph text", html="<b>Paragraph</b> text"),
+        ],
+        text="Paragraph text",
+        authors=["Author"],
+        images=["https://example.com/a.jpg"],
+        top_image="https://example.com/a.jpg",
+        source_url=url,
+    )
+
+
+class TestArticleCache:
+    def test_cache_dir_respects_xdg(self, cache_home):
+        assert get_cache_dir().is_relative_to(cache_home)
+
+    def test_missing_entry(self):
+        assert load_cached_article("https://example.com/missing") is None
+
+    def test_round_trip(self):
+        url = "https://example.com/post"
+        article = _article(url)
+        entry = CachedArticle(
+            article=asdict(article),
+            content_hash=hash_content(b"<html></html>"),
+            etag='"abc"',
+            last_modified="Wed, 01 Jan 2025 00:00:00 GMT",
+        )
+        store_cached_article(url, entry)
+
+        loaded = load_cached_article(url)
+        assert loaded == entry
+        assert _article_from_dict(loaded.article) == article
+
+    def test_rewritten_entry_not_served_stale(self):
+        url = "https://example.com/post"
+        store_cached_article(url, CachedArticle(article=asdict(_article(url)), content_hash="old"))
+        assert load_cached_article(url).content_hash == "old"
+
+        store_cached_article(url, CachedArticle(article=asdict(_article(url)), content_hash="new"))
+        assert load_cached_article(url).content_hash == "new"
+
+    def test_corrupted_entry_ignored(self):
+        url = "https://example.com/post"
+        store_cached_article(url, CachedArticle(article=asdict(_article(url)), content_hash="x"))
+        for path in get_cache_dir().iterdir():
+            path.write_bytes(b"not json")
+
+        assert load_cached_article(url) is None
+
+    def test_hash_content_changes_with_content(self):
+        assert hash_content(b"a") == hash_content(b"a")
+        assert hash_content(b"a") != hash_content(b"b")
+
+    def test_concurrent_writes_do_not_mix(self, tmp_path):
+        path = tmp_path / "entry.json"
+        payloads = [json.dumps({"writer": n, "data": "x" * 100_000}) for n in range(4)]
+
+        def write(payload):
+            for _ in range(20):
+                write_cache_file(path, payload)
+
+        threads = [threading.Thread(target=write, args=(payload,)) for payload in payloads]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert path.read_text(encoding="utf-8") in payloads
+        assert [p.name for p in tmp_path.iterdir()] == ["entry.json"]
+
+    def test_entry_from_older_version_ignored(self):
+        url = "https://example.com/post"
+        store_cached_article(url, CachedArticle(article=asdict(_article(url)), content_hash="x"))
+        for path in get_cache_dir().iterdir():
+            data = json.loads(path.read_bytes())
+            del data["version"]
+            path.write_text(json.dumps(data), encoding="utf-8")
+
+        assert load_cached_article(url) is None
+
+
+def _set_age(url, hours):
+    path = cache._cache_path(url)
+    stamp = path.stat().st_mtime - hours * 3600
+    os.utime(path, (stamp, stamp))
+
+
+class TestCachePruning:
+    @pytest.fixture(autouse=True)
+    def small_cache(self, monkeypatch):
+        monkeypatch.setattr(cache, "MAX_CACHE_ENTRIES", 2)
+
+    def _store(self, url):
+        store_cached_article(url, CachedArticle(article=asdict(_article(url)), content_hash="x"))
+
+    def test_oldest_entries_removed(self):
+        for i, url in enumerate(["https://example.com/a", "https://example.com/b"]):
+            self._store(url)
+            _set_age(url, 10 - i)
+
+        self._store("https://example.com/c")
+
+        assert len(list(get_cache_dir().iterdir())) == 2
+        assert load_cached_article("https://example.com/a") is None
+        assert load_cached_article("https://example.com/b") is not None
+        assert load_cached_article("https://example.com/c") is not None
+
+    def test_read_entry_counts_as_recent(self):
+        for i, url in enumerate(["https://example.com/a", "https://example.com/b"]):
+            self._store(url)
+            _set_age(url, 10 - i)
+
+        assert load_cached_article("https://example.com/a") is not None
+        self._store("https://example.com/c")
+
+        assert load_cached_article("https://example.com/a") is not None
+        assert load_cached_article("https://example.com/b") is None
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pytest
+from click.testing import CliRunner
+
+from url_to_book import extractor, image_handler
+from url_to_book.cli import _download_all_images, _ImageDownloads, _infer_format, main
+from url_to_book.extractor import ExtractedArticle
+from url_to_book.image_handler import DownloadedImage
+
+
+class TestInferFormat:
+    @pytest.mark.parametrize(
+        "output, expected",
+        [
+            ("article.pdf", "pdf"),
+            ("article.EPUB", "epub"),
+            ("dir/article.fb2", "fb2"),
+            ("article.md", "md"),
+            ("article.markdown", "md"),
+            ("article.txt", "pdf"),
+            ("article", "pdf"),
+        ],
+    )
+    def test_infer_format(self, output, expected):
+        assert _infer_format(output) == expected
+
+
+class TestMarkdownConversion:
+    def test_format_inferred_from_output(self, tmp_path):
+        source = tmp_path / "article.md"
+        source.write_text('---\ntitle: "Title"\n---\n\nSome **bold** text.\n', encoding="utf-8")
+        output = tmp_path / "article.fb2"
+
+        result = CliRunner().invoke(main, [str(source), "-o", str(output)])
+
+        assert result.exit_code == 0, result.output
+        assert output.exists()
+        assert "<strong>bold</strong>" in output.read_text(encoding="utf-8")
+
+
+class TestDownloadAllImages:
+    def test_top_and_article_images_downloaded_together(self, monkeypatch, tmp_path):
+        def make_image(name, content_hash):
+            path = tmp_path / name
+            path.write_bytes(b"data")
+            return DownloadedImage(
+                path=path, width=800, height=600, original_url=name, content_hash=content_hash
+            )
+
+        async def fake_top(url, **kwargs):
+            return make_image("top.jpg", "same")
+
+        async def fake_images(urls, max_images, skip_urls, progress_callback, **kwargs):
+            assert urls == ["a.jpg", "b.jpg"]
+            progress_callback(1, 2)
+            progress_callback(2, 2)
+            return [make_image("copy.jpg", "same"), make_image("b.jpg", "other")]
+
+        monkeypatch.setattr(image_handler, "download_top_image_async", fake_top)
+        monkeypatch.setattr(image_handler, "download_images_async", fake_images)
+
+        article = SimpleNamespace(
+            top_image="top.jpg", images=["top.jpg", "a.jpg", "b.jpg", "a.jpg"]
+        )
+        progress = []
+        images = asyncio.run(
+            _download_all_images(
+                article,
+                _ImageDownloads(max_images=10),
+                lambda done, total: progress.append((done, total)),
+            )
+        )
+
+        assert [img.original_url for img in images] == ["top.jpg", "b.jpg"]
+        assert not (tmp_path / "copy.jpg").exists()
+        assert progress[-1] == (3, 3)
+
+    @pytest.mark.parametrize(
+        "top_hash, expected",
+        [("same", ["top.jpg", "b.jpg"]), (None, ["a.jpg"])],
+    )
+    def test_top_image_copy_does_not_use_up_max_images(
+        self, monkeypatch, tmp_path, top_hash, expected
+    ):
+        def make_image(name, content_hash):
+            path = tmp_path / name
+            path.write_bytes(b"data")
+            return DownloadedImage(
+                path=path, width=800, height=600, original_url=name, content_hash=content_hash
+            )
+
+        async def fake_top(url, **kwargs):
+            return make_image("top.jpg", top_hash) if top_hash else None
+
+        async def fake_images(urls, max_images, skip_urls, progress_callback, **kwargs):
+            assert max_images == 2
+            return [make_image("a.jpg", "same"), make_image("b.jpg", "other")]
+
+        monkeypatch.setattr(image_handler, "download_top_image_async", fake_top)
+        monkeypatch.setattr(image_handler, "download_images_async", fake_images)
+
+        article = SimpleNamespace(top_image="top.jpg", images=["a.jpg", "b.jpg"])
+        images = asyncio.run(_download_all_images(article, _ImageDownloads(max_images=1)))
+
+        assert [img.original_url for img in images] == expected
+        assert sorted(path.name for path in tmp_path.iterdir()) == sorted(expected)
+
+
+class TestTopImagePrefetch:
+    @pytest.fixture
+    def run_with_guess(self, monkeypatch, tmp_path):
+        """Run main on a URL whose prefetched top image guess turns out wrong."""
+
+        def run(guess_future):
+            def fake_extract(url, bypass_cache=False, on_top_image=None):
+                on_top_image("https://example.com/guess.jpg")
+                return ExtractedArticle(
+                    title="Title",
+                    content=[],
+                    text="",
+                    authors=[],
+                    images=[],
+                    top_image="https://example.com/top.jpg",
+                    source_url=url,
+                )
+
+            async def fake_top(url, **kwargs):
+                return None
+
+            monkeypatch.setattr(extractor, "extract_article", fake_extract)
+            monkeypatch.setattr(
+                image_handler, "prefetch_top_image", lambda *args: guess_future
+            )
+            monkeypatch.setattr(image_handler, "download_top_image_async", fake_top)
+            output = tmp_path / "article.md"
+            return CliRunner().invoke(main, ["https://example.com/post", "-o", str(output)])
+
+        return run
+
+    def test_pending_guess_cancelled(self, run_with_guess):
+        future = Future()
+
+        result = run_with_guess(future)
+
+        assert result.exit_code == 0, result.output
+        assert future.cancelled()
+
+    def test_running_guess_awaited_before_cleanup(self, run_with_guess):
+        future = Future()
+        future.set_running_or_notify_cancel()
+        threading.Timer(0.1, future.set_result, [None]).start()
+
+        result = run_with_guess(future)
+
+        assert result.exit_code == 0, result.output
+        assert future.done() and not future.cancelled()
@@ -1,7 +1,19 @@
+from types import SimpleNamespace
+
 import pytest
+import requests
 from lxml import html
 
-from url_to_book.extractor import ContentBlock, _clean_html, _extract_content_blocks
+from url_to_book import extractor
+from newspaper.exceptions import ArticleBinaryDataException, ArticleException
+
+from url_to_book.cache import load_cached_article
+from url_to_book.extractor import (
+    ContentBlock,
+    _clean_html,
+    _extract_content_blocks,
+    _find_page_top_image,
+)
 
 
 class TestCleanHtml:
@@ -82,3 +94,156 @@ class TestExtractContentBlocks:
 
         paragraphs = [b for b in blocks if b.type == "paragraph"]
         assert len(paragraphs) == 0
+
+
+class TestFindPageTopImage:
+    def test_og_image_from_raw_page(self):
+        content = (
+            b'<html><head><meta property="og:image" content="/img/top.jpg"></head>'
+            b"<body><p>Text</p></body></html>"
+        )
+        result = _find_page_top_image(content, "https://example.com/post")
+        assert result == "https://example.com/img/top.jpg"
+
+    def test_empty_page(self):
+        assert _find_page_top_image(b"", "https://example.com/post") is None
+
+
+PAGE = (
+    b"<html><body><article>"
+    b"<p>This is a long enough paragraph to pass the filter.</p>"
+    b"</article></body></html>"
+)
+URL = "https://example.com/post"
+
+
+def _response(status_code=200, content=PAGE, etag='"v1"'):
+    return SimpleNamespace(status_code=status_code, content=content, headers={"ETag": etag})
+
+
+class FakeSite:
+    """Stands in for fetch_page/download_article and records the calls."""
+
+    def __init__(self, monkeypatch):
+        self.responses = []
+        self.fetches = []
+        self.parses = 0
+        monkeypatch.setattr(extractor, "fetch_page", self.fetch_page)
+        monkeypatch.setattr(extractor, "download_article", self.download_article)
+
+    def fetch_page(self, url, timeout=30, etag=None, last_modified=None):
+        self.fetches.append(etag)
+        return self.responses.pop(0)
+
+    def download_article(self, url, timeout=30, response=None):
+        self.parses += 1
+        return SimpleNamespace(
+            title=f"Title {self.parses}",
+            text="This is a long enough paragraph to pass the filter.",
+            authors=[],
+            images=[],
+            top_image="",
+            doc=html.fromstring(response.content),
+            html=response.content,
+        )
+
+
+@pytest.fixture
+def site(monkeypatch):
+    return FakeSite(monkeypatch)
+
+
+class TestExtractArticleCache:
+    def test_first_extraction_stored(self, site):
+        site.responses = [_response()]
+
+        article = extractor.extract_article(URL)
+
+        assert site.fetches == [None]
+        assert site.parses == 1
+        assert article.title == "Title 1"
+        cached = load_cached_article(URL)
+        assert cached.etag == '"v1"'
+        assert cached.article["title"] == "Title 1"
+
+    def test_not_modified_served_from_cache(self, site):
+        site.responses = [_response(), _response(status_code=304, content=b"")]
+        first = extractor.extract_article(URL)
+
+        second = extractor.extract_article(URL)
+
+        assert site.fetches == [None, '"v1"']
+        assert site.parses == 1
+        assert second == first
+
+    def test_unchanged_content_served_from_cache(self, site):
+        site.responses = [_response(), _response(etag='"v2"'), _response(status_code=304)]
+        first = extractor.extract_article(URL)
+
+        second = extractor.extract_article(URL)
+
+        assert site.parses == 1
+        assert second == first
+        # The new ETag is kept, so the next run can be answered with 304
+        assert load_cached_article(URL).etag == '"v2"'
+        assert extractor.extract_article(URL) == first
+        assert site.fetches == [None, '"v1"', '"v2"']
+
+    def test_changed_content_reparsed_and_stored(self, site):
+        changed = PAGE.replace(b"long enough", b"changed, long enough")
+        site.responses = [_response(), _response(content=changed, etag='"v2"')]
+        extractor.extract_article(URL)
+
+        second = extractor.extract_article(URL)
+
+        assert site.parses == 2
+        assert second.title == "Title 2"
+        assert load_cached_article(URL).etag == '"v2"'
+
+    def test_bypass_cache_always_reparses(self, site):
+        site.responses = [_response(), _response()]
+        extractor.extract_article(URL)
+
+        second = extractor.extract_article(URL, bypass_cache=True)
+
+        assert site.fetches == [None, None]
+        assert site.parses == 2
+        assert second.title == "Title 2"
+        assert load_cached_article(URL).article["title"] == "Title 2"
+
+
+def _http_response(status_code, content, content_type="text/html; charset=utf-8"):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers["Content-Type"] = content_type
+    response.url = URL
+    return response
+
+
+class TestDownloadArticleErrors:
+    def test_error_status_reported_by_newspaper(self):
+        response = _http_response(404, b"<html><body>Not found</body></html>")
+
+        with pytest.raises(ArticleException, match="failed with Status code 404"):
+            extractor.download_article(URL, response=response)
+
+    def test_protection_hint_kept(self):
+        response = _http_response(403, b"<html><body>Checking (cloudflare)</body></html>")
+
+        with pytest.raises(ArticleException, match="protected with Cloudflare"):
+            extractor.download_article(URL, response=response)
+
+    def test_binary_response_rejected(self):
+        response = _http_response(200, b"%PDF-1.7 ...", content_type="application/pdf")
+
+        with pytest.raises(ArticleBinaryDataException):
+            extractor.download_article(URL, response=response)
+
+    def test_extract_error_not_cached(self, monkeypatch):
+        response = _http_response(404, b"<html><body>Not found</body></html>")
+        monkeypatch.setattr(extractor, "fetch_page", lambda *args, **kwargs: response)
+
+        with pytest.raises(ArticleException, match="Status code 404"):
+            extractor.extract_article(URL)
+        assert load_cached_article(URL) is None
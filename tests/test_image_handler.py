@@ -1,6 +1,19 @@
+import asyncio
+import threading
+import time
+from io import BytesIO
+
 import pytest
+from PIL import Image
 
-from url_to_book.image_handler import is_ad_url
+from url_to_book import image_handler
+from url_to_book.image_handler import (
+    DownloadedImage,
+    download_image,
+    download_images_async,
+    is_ad_url,
+    iter_images_async,
+)
 
 
 class TestIsAdUrl:
@@ -47,3 +60,291 @@ class TestIsAdUrl:
     def test_case_insensitive(self):
         url = "https://example.com/BANNER.jpg"
         assert is_ad_url(url) is True
+
+    def test_keyword_case_insensitive(self):
+        url = "https://example.com/img/PayPal-Donate.png"
+        assert is_ad_url(url) is True
+
+    def test_every_pattern_has_prefilter_token(self):
+        for pattern in image_handler.AD_PATTERNS:
+            assert any(token in pattern for token in image_handler.AD_PATTERN_TOKENS)
+
+    def test_keyword_facebook_pixel(self):
+        url = "https://www.facebook.com/tr?id=123&ev=PageView"
+        assert is_ad_url(url) is True
+
+
+class TestDownloadImagesAsync:
+    @pytest.fixture
+    def fake_download(self, monkeypatch, tmp_path):
+        sizes = {
+            "https://example.com/a.jpg": (800, 600),
+            "https://example.com/small.jpg": (10, 10),
+            "https://example.com/b.jpg": (640, 480),
+            "https://example.com/c.jpg": (1024, 768),
+            "https://example.com/dup.jpg": (800, 600),
+        }
+        fetched = []
+        # dup.jpg serves the same bytes as a.jpg
+        hashes = {"https://example.com/dup.jpg": "https://example.com/a.jpg"}
+
+        def download_image(url, **kwargs):
+            fetched.append(url)
+            if url not in sizes:
+                return None
+            path = tmp_path / url.rsplit("/", 1)[-1]
+            path.write_bytes(b"data")
+            width, height = sizes[url]
+            return DownloadedImage(
+                path=path,
+                width=width,
+                height=height,
+                original_url=url,
+                content_hash=hashes.get(url, url),
+            )
+
+        monkeypatch.setattr(image_handler, "download_image", download_image)
+        return fetched
+
+    def test_keeps_order_and_filters(self, fake_download):
+        urls = [
+            "https://example.com/a.jpg",
+            "https://example.com/small.jpg",
+            "https://example.com/missing.jpg",
+            "https://example.com/b.jpg",
+        ]
+        images = asyncio.run(download_images_async(urls))
+
+        assert [img.original_url for img in images] == [
+            "https://example.com/a.jpg",
+            "https://example.com/b.jpg",
+        ]
+        assert all(img.path.exists() for img in images)
+
+    def test_per_host_limit(self, monkeypatch, tmp_path):
+        lock = threading.Lock()
+        in_flight = {}
+        peak = {}
+
+        def download_image(url, **kwargs):
+            host = url.split("/")[2]
+            with lock:
+                in_flight[host] = in_flight.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), in_flight[host])
+            time.sleep(0.02)
+            with lock:
+                in_flight[host] -= 1
+            path = tmp_path / f"{host}-{url.rsplit('/', 1)[-1]}"
+            path.write_bytes(b"data")
+            return DownloadedImage(
+                path=path, width=800, height=600, original_url=url, content_hash=url
+            )
+
+        monkeypatch.setattr(image_handler, "download_image", download_image)
+        urls = [f"https://{host}.example.com/{i}.jpg" for host in ("a", "b") for i in range(4)]
+
+        images = asyncio.run(download_images_async(urls, max_images=8, max_per_host=2))
+
+        assert len(images) == 8
+        assert max(peak.values()) <= 2
+
+    def test_max_concurrent_downloads_run_at_once(self, monkeypatch, tmp_path):
+        # Only passes if all downloads are in flight together, whatever the CPU count
+        barrier = threading.Barrier(12, timeout=5)
+
+        def download_image(url, **kwargs):
+            barrier.wait()
+            path = tmp_path / url.split("/")[2]
+            path.write_bytes(b"data")
+            return DownloadedImage(
+                path=path, width=800, height=600, original_url=url, content_hash=url
+            )
+
+        monkeypatch.setattr(image_handler, "download_image", download_image)
+        urls = [f"https://host{i}.example.com/image.jpg" for i in range(12)]
+
+        images = asyncio.run(download_images_async(urls, max_images=12, max_concurrent=12))
+
+        assert len(images) == 12
+
+    def test_duplicate_urls_fetched_once(self, fake_download):
+        urls = [
+            "https://example.com/a.jpg",
+            "https://example.com/a.jpg",
+            "https://example.com/b.jpg",
+        ]
+        images = asyncio.run(download_images_async(urls))
+
+        assert fake_download.count("https://example.com/a.jpg") == 1
+        assert [img.original_url for img in images] == [
+            "https://example.com/a.jpg",
+            "https://example.com/b.jpg",
+        ]
+
+    def test_duplicate_content_dropped(self, fake_download, tmp_path):
+        urls = [
+            "https://example.com/a.jpg",
+            "https://example.com/dup.jpg",
+            "https://example.com/b.jpg",
+        ]
+        images = asyncio.run(download_images_async(urls))
+
+        assert [img.original_url for img in images] == [
+            "https://example.com/a.jpg",
+            "https://example.com/b.jpg",
+        ]
+        assert not (tmp_path / "dup.jpg").exists()
+
+    def test_skip_hashes(self, fake_download):
+        urls = ["https://example.com/a.jpg", "https://example.com/b.jpg"]
+        images = asyncio.run(
+            download_images_async(urls, skip_hashes={"https://example.com/a.jpg"})
+        )
+
+        assert [img.original_url for img in images] == ["https://example.com/b.jpg"]
+
+    def test_stream_yields_indexed_images(self, fake_download):
+        urls = [
+            "https://example.com/a.jpg",
+            "https://example.com/small.jpg",
+            "https://example.com/b.jpg",
+        ]
+
+        async def collect():
+            return [result async for result in iter_images_async(urls, max_concurrent=2)]
+
+        results = sorted(asyncio.run(collect()), key=lambda result: result[0])
+
+        assert [(index, img.original_url) for index, img in results] == [
+            (0, "https://example.com/a.jpg"),
+            (2, "https://example.com/b.jpg"),
+        ]
+
+    def test_respects_max_images_and_skip_urls(self, fake_download, tmp_path):
+        urls = [
+            "https://example.com/a.jpg",
+            "https://example.com/b.jpg",
+            "https://example.com/c.jpg",
+            "https://example.com/ads/promo.jpg",
+        ]
+        progress = []
+        images = asyncio.run(
+            download_images_async(
+                urls,
+                max_images=1,
+                skip_urls={"https://example.com/a.jpg"},
+                progress_callback=lambda done, total: progress.append((done, total)),
+            )
+        )
+
+        assert [img.original_url for img in images] == ["https://example.com/b.jpg"]
+        assert "https://example.com/a.jpg" not in fake_download
+        assert "https://example.com/ads/promo.jpg" not in fake_download
+        assert not (tmp_path / "c.jpg").exists()
+        assert progress == [(1, 1)]
+
+    def test_stops_once_max_images_accepted(self, monkeypatch, tmp_path):
+        release = threading.Event()
+        written = []
+
+        def download_image(url, **kwargs):
+            if "slow" in url:
+                release.wait(5)
+            path = tmp_path / url.rsplit("/", 1)[-1]
+            path.write_bytes(b"data")
+            written.append(path)
+            return DownloadedImage(
+                path=path, width=800, height=600, original_url=url, content_hash=url
+            )
+
+        monkeypatch.setattr(image_handler, "download_image", download_image)
+        urls = ["https://example.com/a.jpg", "https://example.com/slow.jpg"]
+
+        images = asyncio.run(download_images_async(urls, max_images=1))
+        release.set()
+
+        assert [img.original_url for img in images] == ["https://example.com/a.jpg"]
+        # The worker cannot be interrupted, but its file is removed once it ends
+        deadline = time.monotonic() + 5
+        while len(written) < 2 or (tmp_path / "slow.jpg").exists():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert (tmp_path / "a.jpg").exists()
+
+
+class _FakeResponse:
+    def __init__(self, content, content_type):
+        self.content = content
+        self.headers = {"content-type": content_type}
+
+    def raise_for_status(self):
+        pass
+
+
+def _encode(mode, fmt, size=(200, 150)):
+    buffer = BytesIO()
+    Image.new(mode, size).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+class TestDownloadImage:
+    @pytest.fixture
+    def serve(self, monkeypatch):
+        def serve(content, content_type):
+            monkeypatch.setattr(
+                image_handler._SESSION,
+                "get",
+                lambda url, **kwargs: _FakeResponse(content, content_type),
+            )
+
+        return serve
+
+    def test_jpeg_kept_without_reencoding(self, serve):
+        content = _encode("RGB", "JPEG")
+        serve(content, "image/jpeg")
+
+        img = download_image("https://example.com/photo.jpeg?size=large")
+        try:
+            assert (img.width, img.height) == (200, 150)
+            assert img.path.suffix == ".jpg"
+            assert img.path.read_bytes() == content
+        finally:
+            img.path.unlink()
+
+    def test_png_with_alpha_converted(self, serve):
+        serve(_encode("RGBA", "PNG"), "image/png")
+
+        img = download_image("https://example.com/photo.png")
+        try:
+            assert img.path.suffix == ".png"
+            with Image.open(img.path) as saved:
+                assert saved.mode == "RGB"
+        finally:
+            img.path.unlink()
+
+    def test_written_to_download_dir(self, serve, tmp_path):
+        serve(_encode("RGB", "JPEG"), "image/jpeg")
+
+        img = download_image("https://example.com/photo.jpg", download_dir=tmp_path)
+
+        assert img.path.parent == tmp_path
+
+    def test_non_image_content_rejected(self, serve):
+        serve(b"<html></html>", "text/html")
+
+        assert download_image("https://example.com/page") is None
+
+    def test_uses_given_session(self):
+        content = _encode("RGB", "JPEG")
+        requested = []
+
+        class Session:
+            def get(self, url, **kwargs):
+                requested.append(url)
+                return _FakeResponse(content, "image/jpeg")
+
+        img = download_image("https://example.com/photo.jpg", session=Session())
+        try:
+            assert requested == ["https://example.com/photo.jpg"]
+        finally:
+            img.path.unlink()
@@ -1,32 +1,39 @@
+from pathlib import Path
+
 import pytest
 
+from url_to_book.extractor import ContentBlock, ExtractedArticle
+from url_to_book.image_handler import DownloadedImage
+from url_to_book.renderers import ImageBlock, InlineElement, InlineType, ParagraphBlock
+from url_to_book.renderers.converter import INLINE_TAG_RE, ArticleToDocumentConverter
 
-class TestWriteFormattedTextParsing:
-    def test_parse_bold_tags(self):
-        import re
 
-        html_text = "Text <b>bold</b> normal"
-        tag_pattern = re.compile(r'<(/?)([biu])>|<a href="([^"]+)">|</a>', re.IGNORECASE)
+def _tokenize(html_text):
+    parts = []
+    last_end = 0
+    for match in INLINE_TAG_RE.finditer(html_text):
+        if match.start() > last_end:
+            parts.append(("text", html_text[last_end:match.start()]))
 
-        parts = []
-        last_end = 0
-        for match in tag_pattern.finditer(html_text):
-            if match.start() > last_end:
-                parts.append(("text", html_text[last_end:match.start()]))
+        closing, tag, href = match.group(1, 2, 3)
+        if tag:
+            prefix = "end_" if closing else "start_"
+            parts.append((prefix + tag.lower(), None))
+        elif href:
+            parts.append(("start_link", href))
+        else:
+            parts.append(("end_link", None))
 
-            if match.group(0) == "</a>":
-                parts.append(("end_link", None))
-            elif match.group(3):
-                parts.append(("start_link", match.group(3)))
-            elif match.group(1) == "/":
-                parts.append(("end_" + match.group(2).lower(), None))
-            else:
-                parts.append(("start_" + match.group(2).lower(), None))
+        last_end = match.end()
 
-            last_end = match.end()
+    if last_end < len(html_text):
+        parts.append(("text", html_text[last_end:]))
+    return parts
 
-        if last_end < len(html_text):
-            parts.append(("text", html_text[last_end:]))
+
+class TestWriteFormattedTextParsing:
+    def test_parse_bold_tags(self):
+        parts = _tokenize("Text <b>bold</b> normal")
 
         assert parts == [
             ("text", "Text "),
@@ -37,30 +44,7 @@ class TestWriteFormattedTextParsing:
         ]
 
     def test_parse_link_tags(self):
-        import re
-
-        html_text = 'Visit <a href="https://example.com">site</a> now'
-        tag_pattern = re.compile(r'<(/?)([biu])>|<a href="([^"]+)">|</a>', re.IGNORECASE)
-
-        parts = []
-        last_end = 0
-        for match in tag_pattern.finditer(html_text):
-            if match.start() > last_end:
-                parts.append(("text", html_text[last_end:match.start()]))
-
-            if match.group(0) == "</a>":
-                parts.append(("end_link", None))
-            elif match.group(3):
-                parts.append(("start_link", match.group(3)))
-            elif match.group(1) == "/":
-                parts.append(("end_" + match.group(2).lower(), None))
-            else:
-                parts.append(("start_" + match.group(2).lower(), None))
-
-            last_end = match.end()
-
-        if last_end < len(html_text):
-            parts.append(("text", html_text[last_end:]))
+        parts = _tokenize('Visit <a href="https://example.com">site</a> now')
 
         assert parts == [
             ("text", "Visit "),
@@ -71,32 +55,80 @@ class TestWriteFormattedTextParsing:
         ]
 
     def test_parse_mixed_formatting(self):
-        import re
+        parts = _tokenize("<b>Bold <i>and italic</i></b>")
 
-        html_text = "<b>Bold <i>and italic</i></b>"
-        tag_pattern = re.compile(r'<(/?)([biu])>|<a href="([^"]+)">|</a>', re.IGNORECASE)
+        assert ("start_b", None) in parts
+        assert ("start_i", None) in parts
+        assert ("end_i", None) in parts
+        assert ("end_b", None) in parts
 
-        parts = []
-        last_end = 0
-        for match in tag_pattern.finditer(html_text):
-            if match.start() > last_end:
-                parts.append(("text", html_text[last_end:match.start()]))
+    def test_parse_uppercase_tags(self):
+        parts = _tokenize("<B>Bold</B> text</A>")
 
-            if match.group(0) == "</a>":
-                parts.append(("end_link", None))
-            elif match.group(3):
-                parts.append(("start_link", match.group(3)))
-            elif match.group(1) == "/":
-                parts.append(("end_" + match.group(2).lower(), None))
-            else:
-                parts.append(("start_" + match.group(2).lower(), None))
+        assert parts == [
+            ("start_b", None),
+            ("text", "Bold"),
+            ("end_b", None),
+            ("text", " text"),
+            ("end_link", None),
+        ]
 
-            last_end = match.end()
 
-        if last_end < len(html_text):
-            parts.append(("text", html_text[last_end:]))
+class TestParseInline:
+    def test_mixed_tags(self):
+        elements = ArticleToDocumentConverter()._parse_inline(
+            'Plain <B>bold</b> <a href="https://example.com">link</a> <i>it</I>'
+        )
 
-        assert ("start_b", None) in parts
-        assert ("start_i", None) in parts
-        assert ("end_i", None) in parts
-        assert ("end_b", None) in parts
+        assert elements == [
+            InlineElement(type=InlineType.TEXT, content="Plain "),
+            InlineElement(type=InlineType.BOLD, content="bold"),
+            InlineElement(type=InlineType.TEXT, content=" "),
+            InlineElement(type=InlineType.LINK, content="link", url="https://example.com"),
+            InlineElement(type=InlineType.TEXT, content=" "),
+            InlineElement(type=InlineType.ITALIC, content="it"),
+        ]
+
+    def test_plain_text(self):
+        elements = ArticleToDocumentConverter()._parse_inline("Just text")
+
+        assert elements == [InlineElement(type=InlineType.TEXT, content="Just text")]
+
+    def test_empty_text(self):
+        assert ArticleToDocumentConverter()._parse_inline("") == []
+
+    def test_less_than_sign_in_text(self):
+        elements = ArticleToDocumentConverter()._parse_inline("1 < 2 and <b>bold</b>")
+
+        assert elements == [
+            InlineElement(type=InlineType.TEXT, content="1 < 2 and "),
+            InlineElement(type=InlineType.BOLD, content="bold"),
+        ]
+
+
+class TestConvertArticle:
+    def test_images_spread_between_paragraphs(self):
+        article = ExtractedArticle(
+            title="Title",
+            content=[
+                ContentBlock(type="paragraph", text=f"Paragraph {i}") for i in range(4)
+            ],
+            text="",
+            authors=[],
+            images=[],
+            top_image=None,
+            source_url="https://example.com/post",
+        )
+        images = [
+            DownloadedImage(path=Path(f"{i}.jpg"), width=800, height=600, original_url=f"{i}.jpg")
+            for i in range(3)
+        ]
+
+        document = ArticleToDocumentConverter().convert(article, images)
+
+        layout = [
+            block.url if isinstance(block, ImageBlock) else "p"
+            for block in document.blocks
+        ]
+        assert layout == ["0.jpg", "p", "1.jpg", "p", "2.jpg", "p", "p"]
+        assert all(isinstance(block, (ImageBlock, ParagraphBlock)) for block in document.blocks)
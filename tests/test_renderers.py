@@ -0,0 +1,271 @@
+import importlib
+import json
+import os
+
+import pytest
+from fpdf.enums import TextEmphasis
+
+from url_to_book.renderers import (
+    Document,
+    DocumentMetadata,
+    HeadingBlock,
+    InlineElement,
+    InlineType,
+    ParagraphBlock,
+    RenderError,
+    RenderOptions,
+    get_renderer,
+    preload_pdf,
+    render_documents,
+)
+from url_to_book.renderers import pdf_renderer
+
+
+@pytest.fixture
+def document():
+    return Document(
+        metadata=DocumentMetadata(title="Test title", authors=["Author"]),
+        blocks=[
+            HeadingBlock(level=2, content=[InlineElement(type=InlineType.TEXT, content="Heading")]),
+            ParagraphBlock(
+                content=[
+                    InlineElement(type=InlineType.TEXT, content="Text with "),
+                    InlineElement(type=InlineType.BOLD, content="bold"),
+                ]
+            ),
+        ],
+    )
+
+
+class TestRenderDocuments:
+    def test_renders_all_targets_in_order(self, document, tmp_path):
+        targets = [(tmp_path / "article.md", "md"), (tmp_path / "article.fb2", "fb2")]
+        paths = render_documents(document, targets, RenderOptions(include_images=False))
+
+        assert paths == [tmp_path / "article.md", tmp_path / "article.fb2"]
+        assert "**bold**" in paths[0].read_text(encoding="utf-8")
+        assert "<strong>bold</strong>" in paths[1].read_text(encoding="utf-8")
+
+    def test_workers_spawned_not_forked(self, document, tmp_path, monkeypatch):
+        # The package exports the registry instance under the module's name
+        registry = importlib.import_module("url_to_book.renderers.registry")
+        contexts = []
+        real_executor = registry.ProcessPoolExecutor
+
+        def recording_executor(*args, **kwargs):
+            contexts.append(kwargs.get("mp_context"))
+            return real_executor(*args, **kwargs)
+
+        monkeypatch.setattr(registry, "ProcessPoolExecutor", recording_executor)
+        targets = [(tmp_path / "article.md", "md"), (tmp_path / "article.fb2", "fb2")]
+
+        render_documents(document, targets)
+
+        assert [context.get_start_method() for context in contexts] == ["spawn"]
+
+    def test_single_target(self, document, tmp_path):
+        paths = render_documents(document, [(tmp_path / "article", "md")])
+
+        assert paths == [tmp_path / "article.md"]
+        assert paths[0].exists()
+
+
+class TestPreloadPdf:
+    def test_render_uses_preloaded_pdf_once(self, document, tmp_path):
+        options = RenderOptions(include_images=False)
+        preload_pdf(options)
+        assert "pdf" in options.extra
+
+        path = get_renderer("pdf").render(document, tmp_path / "article.pdf", options)
+
+        assert path.read_bytes().startswith(b"%PDF")
+        assert "pdf" not in options.extra
+
+
+class TestArticlePdf:
+    def test_styles_loaded_on_first_use(self):
+        pdf = pdf_renderer.ArticlePDF()
+        assert list(pdf.fonts) == ["unicodefont"]
+
+        pdf.set_font(pdf._font_name, "B", 12)
+
+        assert "unicodefontB" in pdf.fonts
+        assert "B" not in pdf._pending_fonts
+
+    @pytest.mark.parametrize(
+        "family, style",
+        [
+            ("unicodefont", "B"),
+            ("UnicodeFont", "BU"),
+            ("UnicodeFont", "ub"),
+            ("", "B"),
+            ("UnicodeFont", TextEmphasis.B | TextEmphasis.U),
+        ],
+    )
+    def test_style_loaded_for_fpdf_style_spellings(self, family, style):
+        pdf = pdf_renderer.ArticlePDF()
+
+        pdf.set_font(family, style, 12)
+
+        assert "unicodefontB" in pdf.fonts
+        assert pdf.font_style == "B"
+
+    @pytest.mark.parametrize("style", ["B", "I"])
+    def test_broken_style_font_is_render_error(self, tmp_path, style):
+        pdf = pdf_renderer.ArticlePDF()
+        pdf._pending_fonts[style] = (str(tmp_path / "Missing.ttf"), 400)
+        options = RenderOptions(include_images=False, extra={"pdf": pdf})
+        document = Document(
+            metadata=DocumentMetadata(title="Title"),
+            blocks=[ParagraphBlock(content=[InlineElement(type=InlineType.ITALIC, content="x")])],
+        )
+
+        with pytest.raises(RenderError, match="Failed to add font"):
+            get_renderer("pdf").render(document, tmp_path / "article.pdf", options)
+
+    def test_unreadable_font_reported(self, tmp_path):
+        pdf = pdf_renderer.ArticlePDF()
+
+        with pytest.raises(RuntimeError, match="Failed to add font"):
+            pdf._add_font_with_variations(str(tmp_path / "Missing[wght].ttf"), "B", 700)
+
+
+def _clear_font_memos():
+    pdf_renderer._resolve_all_font_files.cache_clear()
+    pdf_renderer._scan_available_fonts.cache_clear()
+
+
+class TestFontDiscovery:
+    @pytest.fixture(autouse=True)
+    def clear_memos(self):
+        _clear_font_memos()
+        yield
+        _clear_font_memos()
+
+    @pytest.fixture
+    def scans(self, monkeypatch):
+        calls = []
+        real_existing_font_files = pdf_renderer._existing_font_files
+
+        def counting_existing_font_files():
+            calls.append(True)
+            return real_existing_font_files()
+
+        monkeypatch.setattr(pdf_renderer, "_existing_font_files", counting_existing_font_files)
+        return calls
+
+    def test_filesystem_scanned_once(self, scans):
+        available = pdf_renderer.find_available_fonts()
+        default = pdf_renderer.get_default_font()
+        pdf_renderer.get_font_family(default)
+        pdf_renderer.find_available_fonts()
+
+        assert default == available[0]
+        assert len(scans) == 1
+
+    def test_disk_cache_reused_by_next_run(self, scans, cache_home):
+        available = pdf_renderer.find_available_fonts()
+        assert (cache_home / "url_to_book" / "fonts.json").exists()
+
+        _clear_font_memos()
+        scans.clear()
+
+        assert pdf_renderer.find_available_fonts() == available
+        assert not scans
+
+    def test_stale_disk_cache_ignored(self, scans, cache_home):
+        cache_file = cache_home / "url_to_book" / "fonts.json"
+        cache_file.parent.mkdir(parents=True)
+        cache_file.write_text('{"key": "old", "fonts": {}}', encoding="utf-8")
+
+        pdf_renderer.find_available_fonts()
+
+        assert scans
+        assert '"old"' not in cache_file.read_text(encoding="utf-8")
+
+    def test_disk_cache_of_other_version_ignored(self, scans, cache_home):
+        pdf_renderer.find_available_fonts()
+        cache_file = cache_home / "url_to_book" / "fonts.json"
+        data = json.loads(cache_file.read_text(encoding="utf-8"))
+        data["version"] = pdf_renderer.FONT_CACHE_VERSION + 1
+        cache_file.write_text(json.dumps(data), encoding="utf-8")
+        _clear_font_memos()
+
+        pdf_renderer.find_available_fonts()
+
+        assert len(scans) == 2
+
+    def test_scan_matches_per_path_lookup(self):
+        existing = pdf_renderer._existing_font_files()
+
+        for family in pdf_renderer.FONT_FAMILIES.values():
+            for paths in (family.regular, family.bold, family.italic, family.bold_italic):
+                for path in paths:
+                    assert (path in existing) == os.path.isfile(path)
+
+    def test_font_files_resolved_once(self, scans):
+        pdf_renderer.ArticlePDF()
+        pdf_renderer.ArticlePDF()
+
+        assert len(scans) == 1
+
+
+class _RecordingPdf:
+    _font_name = "UnicodeFont"
+
+    def __init__(self):
+        self.calls = []
+
+    def set_font(self, family, style="", size=0):
+        self.calls.append(("set_font", style))
+
+    def set_text_color(self, *rgb):
+        self.calls.append(("color", rgb))
+
+    def write(self, height, text, link=""):
+        self.calls.append(("write", text, link))
+
+    def ln(self):
+        self.calls.append(("ln",))
+
+
+class TestWriteInlineElements:
+    def test_runs_merged_and_font_switched_on_change(self):
+        pdf = _RecordingPdf()
+        elements = [
+            InlineElement(type=InlineType.TEXT, content="a "),
+            InlineElement(type=InlineType.TEXT, content="b "),
+            InlineElement(type=InlineType.LINK, content="link", url="https://example.com"),
+            InlineElement(type=InlineType.BOLD, content="c"),
+        ]
+
+        pdf_renderer.PDFRenderer()._write_inline_elements(pdf, elements)
+
+        assert pdf.calls == [
+            ("set_font", ""),
+            ("write", "a b ", ""),
+            ("color", pdf_renderer.LINK_COLOR),
+            ("write", "link", "https://example.com"),
+            ("set_font", "B"),
+            ("color", (0, 0, 0)),
+            ("write", "c", ""),
+            ("ln",),
+        ]
+
+    def test_consecutive_links_keep_link_color(self):
+        pdf = _RecordingPdf()
+        elements = [
+            InlineElement(type=InlineType.LINK, content="one", url="https://a.example"),
+            InlineElement(type=InlineType.LINK, content="two", url="https://b.example"),
+        ]
+
+        pdf_renderer.PDFRenderer()._write_inline_elements(pdf, elements)
+
+        assert pdf.calls == [
+            ("set_font", ""),
+            ("color", pdf_renderer.LINK_COLOR),
+            ("write", "one", "https://a.example"),
+            ("write", "two", "https://b.example"),
+            ("color", (0, 0, 0)),
+            ("ln",),
+        ]
@@ -0,0 +1,137 @@
+"""On-disk cache of extracted articles keyed by URL."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+# Bump whenever the extracted article changes shape or content (e.g. a change
+# in _parse_article), so entries written by older versions are re-extracted.
+CACHE_VERSION = 2
+
+# Least recently used entries beyond this count are removed on store
+MAX_CACHE_ENTRIES = 500
+
+# Reading an entry refreshes its mtime (the LRU clock) at most this often
+_TOUCH_INTERVAL_NS = 3600 * 10**9
+
+
+@dataclass
+class CachedArticle:
+    article: dict[str, Any]  # ExtractedArticle as plain JSON-compatible data
+    content_hash: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    version: int = CACHE_VERSION
+
+
+def get_cache_root() -> Path:
+    """Get the url_to_book cache directory (respects XDG_CACHE_HOME)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "url_to_book"
+
+
+def get_cache_dir() -> Path:
+    """Get the directory for cached articles."""
+    return get_cache_root() / "articles"
+
+
+def write_cache_file(path: Path, text: str) -> None:
+    """Atomically replace path with text.
+
+    The text goes to a temp file of its own first, so concurrent runs
+    writing the same entry never mix their writes.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+            tmp_file.write(text)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def hash_content(content: bytes) -> str:
+    """Hash page content for revalidation of cached articles."""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def _cache_path(url: str) -> Path:
+    key = hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+    return get_cache_dir() / f"{key}.json"
+
+
+@lru_cache(maxsize=8)
+def _read_entry(path: Path, mtime_ns: int) -> Optional[CachedArticle]:
+    """Read and decode cache file; mtime_ns keys the memo to the file version."""
+    del mtime_ns  # only part of the memo key
+    try:
+        data = json.loads(path.read_bytes())
+        if data.get("version") != CACHE_VERSION:
+            return None
+        return CachedArticle(**data)
+    except Exception:
+        return None
+
+
+def load_cached_article(url: str) -> Optional[CachedArticle]:
+    """Load cached article for URL, or None if missing or unreadable."""
+    path = _cache_path(url)
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    entry = _read_entry(path, mtime_ns)
+    if entry is None or entry.article.get("source_url") != url:
+        return None
+
+    # Mark as recently used; coarse, so the memo above stays useful
+    if time.time_ns() - mtime_ns > _TOUCH_INTERVAL_NS:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+    return entry
+
+
+def store_cached_article(url: str, entry: CachedArticle) -> None:
+    """Save article to cache. Failures are ignored, the cache is best-effort."""
+    path = _cache_path(url)
+    try:
+        write_cache_file(path, json.dumps(asdict(entry), ensure_ascii=False))
+        _prune_cache(path.parent, MAX_CACHE_ENTRIES)
+    except OSError:
+        pass
+
+
+def _prune_cache(cache_dir: Path, max_entries: int) -> None:
+    """Remove least recently used entries so at most max_entries remain."""
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".json"):
+                try:
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    continue
+
+    if len(entries) <= max_entries:
+        return
+
+    entries.sort(reverse=True)
+    for _, path in entries[max_entries:]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
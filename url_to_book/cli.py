@@ -1,10 +1,14 @@
+import asyncio
+import concurrent.futures
+import shutil
+import tempfile
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
 import click
 
-from .extractor import extract_article
-from .image_handler import cleanup_images, download_images, download_top_image
-from .progress import ProgressReporter
 from .renderers import (
     ArticleToDocumentConverter,
     MarkdownToDocumentConverter,
@@ -14,9 +18,39 @@ from .renderers import (
     get_font_families,
     get_renderer,
     list_formats,
+    preload_pdf,
 )
 from .state_machine import JobState
 
+# extractor (newspaper4k + nltk), image_handler and progress (rich) are
+# imported where they are used, so --help, --list-* and Markdown conversion
+# don't pay for them.
+if TYPE_CHECKING:
+    from .progress import ProgressReporter
+
+DEFAULT_FORMAT = "pdf"
+
+_NO_URLS: frozenset[str] = frozenset()
+
+FORMATS_BY_EXTENSION = {
+    "pdf": "pdf",
+    "epub": "epub",
+    "fb2": "fb2",
+    "md": "md",
+    "markdown": "md",
+}
+
+
+@dataclass
+class _ImageDownloads:
+    """How the images of one article are downloaded."""
+
+    max_images: int
+    session: Any = None  # requests.Session shared by all downloads
+    download_dir: Optional[Path] = None
+    max_concurrent: int = 16
+    max_per_host: int = 4
+
 
 def _handle_list_fonts() -> None:
     """Handle --list-fonts flag: display available fonts and exit."""
@@ -52,14 +86,19 @@ def _handle_list_formats() -> None:
         click.echo(f"  * {fmt} (features: {features})")
 
 
-def _validate_required_args(source: str | None, output: str | None) -> None:
-    """Validate that required arguments are provided."""
+def _validate_required_args(source: str | None, output: str | None) -> tuple[str, str]:
+    """Validate that required arguments are provided.
+
+    Returns:
+        Tuple of (source, output), no longer optional
+    """
     if not source:
         raise click.ClickException(
             "SOURCE is required (URL or path to .md file, unless using --list-fonts/--list-formats)"
         )
     if not output:
         raise click.ClickException("Output file path is required (-o/--output)")
+    return source, output
 
 
 def _show_font_info(font: str | None, verbose: bool) -> None:
@@ -89,29 +128,43 @@ def _show_article_info(article, url: str, verbose: bool) -> None:
     click.echo(f"Found {len(article.images)} images")
 
 
-def _download_article_images(article, no_images: bool, max_images: int, verbose: bool):
-    """Download article images if needed."""
+def _download_article_images(article, verbose: bool, downloads: Optional[_ImageDownloads]):
+    """Download article images if needed.
+
+    Returns:
+        List of images, starting with the top image if one was downloaded
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from .image_handler import download_images, download_top_image
+
     top_image = None
     images = []
 
-    if no_images:
-        return top_image, images
+    if downloads is None:
+        return images
 
     show_progress = not verbose
 
     if article.top_image:
         top_image = download_top_image(
-            article.top_image, verbose=verbose, show_progress=show_progress
+            article.top_image,
+            verbose=verbose,
+            show_progress=show_progress,
+            session=downloads.session,
+            download_dir=downloads.download_dir,
         )
 
     if article.images:
-        skip_urls = {article.top_image} if article.top_image else set()
+        skip_urls = frozenset((article.top_image,)) if article.top_image else _NO_URLS
         images = download_images(
             article.images,
-            max_images=max_images,
+            max_images=downloads.max_images,
             verbose=verbose,
             skip_urls=skip_urls,
             show_progress=show_progress,
+            skip_hashes={top_image.content_hash} if top_image else None,
+            session=downloads.session,
+            download_dir=downloads.download_dir,
         )
 
     if not verbose:
@@ -122,45 +175,158 @@ def _download_article_images(article, no_images: bool, max_images: int, verbose:
             f"Downloaded {len(images)} images" + (" + top image" if top_image else "")
         )
 
-    return top_image, images
+    if top_image:
+        images.insert(0, top_image)
+    return images
 
 
-def _download_article_images_with_progress(
-    article, no_images: bool, max_images: int, progress_reporter: ProgressReporter
+async def _download_all_images(
+    article,
+    downloads: _ImageDownloads,
+    progress_callback=None,
+    top_image_future=None,
 ):
-    """Download article images with progress updates."""
-    top_image = None
-    images = []
+    """Download top image and article images concurrently.
 
-    if no_images:
-        return top_image, images
+    Args:
+        downloads: Limits, session and directory for the downloads
+        top_image_future: Download of article.top_image already in flight, if any
 
-    total_images = 0
-    if article.top_image:
-        total_images += 1
-    if article.images:
-        total_images += min(len(article.images), max_images)
+    Returns:
+        List of images, starting with the top image if one was downloaded
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from .image_handler import cleanup_images, download_images_async, download_top_image_async
+
+    max_images = downloads.max_images
+    image_urls = [url for url in dict.fromkeys(article.images) if url != article.top_image]
+    article_images = min(len(image_urls), max_images)
+    total_images = (1 if article.top_image else 0) + article_images
+    top_done = 0
+    images_done = 0
+
+    def report():
+        if progress_callback:
+            progress_callback(top_done + images_done, total_images)
+
+    async def fetch_top():
+        nonlocal top_done
+        if not article.top_image:
+            return None
+        if top_image_future is not None:
+            img = await asyncio.wrap_future(top_image_future)
+        else:
+            img = await download_top_image_async(
+                article.top_image, session=downloads.session, download_dir=downloads.download_dir
+            )
+        if img:
+            top_done = 1
+            report()
+        return img
+
+    def on_images_downloaded(downloaded: int, _total: int):
+        nonlocal images_done
+        images_done = min(downloaded, article_images)
+        report()
+
+    top_image, images = await asyncio.gather(
+        fetch_top(),
+        # One spare, in case an article image turns out to be the top image
+        download_images_async(
+            image_urls,
+            max_images=max_images + 1,
+            skip_urls=None,
+            progress_callback=on_images_downloaded,
+            session=downloads.session,
+            download_dir=downloads.download_dir,
+            max_concurrent=downloads.max_concurrent,
+            max_per_host=downloads.max_per_host,
+        ),
+    )
+
+    # Both downloads ran at once, so drop copies of the top image afterwards
+    if top_image:
+        duplicates = [img for img in images if img.content_hash == top_image.content_hash]
+        cleanup_images(duplicates)
+        images = [img for img in images if img.content_hash != top_image.content_hash]
+
+    cleanup_images(images[max_images:])
+    images = images[:max_images]
+    return [top_image] + images if top_image else images
+
+
+async def _download_while_preparing(
+    article,
+    downloads: _ImageDownloads,
+    progress_callback=None,
+    prepare: Callable[[], None] | None = None,
+    top_image_future=None,
+):
+    """Download images while prepare (e.g. renderer font loading) runs in a thread."""
+    download = _download_all_images(
+        article,
+        downloads,
+        progress_callback=progress_callback,
+        top_image_future=top_image_future,
+    )
+    if prepare is None:
+        return await download
 
-    def on_image_downloaded(downloaded: int, total: int):
-        progress_reporter.update_images_progress(downloaded, total)
+    images, _ = await asyncio.gather(download, asyncio.to_thread(prepare))
+    return images
 
-    if article.top_image:
-        top_image = download_top_image(article.top_image, verbose=False, show_progress=False)
-        if top_image:
-            on_image_downloaded(1, total_images)
 
-    if article.images:
-        skip_urls = {article.top_image} if article.top_image else set()
-        images = download_images(
-            article.images,
-            max_images=max_images,
-            verbose=False,
-            skip_urls=skip_urls,
-            show_progress=False,
-            progress_callback=on_image_downloaded,
+def _download_article_images_with_progress(
+    article,
+    downloads: Optional[_ImageDownloads],
+    progress_reporter: "ProgressReporter",
+    prepare: Callable[[], None] | None = None,
+    top_image_future=None,
+):
+    """Download article images concurrently with progress updates.
+
+    Args:
+        downloads: Limits, session and directory for the downloads (None: no images)
+        prepare: Optional blocking callable run alongside the downloads
+        top_image_future: Download of the top image already in flight, if any
+    """
+    if downloads is None:
+        return []
+
+    return asyncio.run(
+        _download_while_preparing(
+            article,
+            downloads,
+            progress_callback=progress_reporter.update_images_progress,
+            prepare=prepare,
+            top_image_future=top_image_future,
         )
+    )
+
+
+def _prefetch_top_image(prefetched: dict, downloads: _ImageDownloads, url: str) -> None:
+    """Start downloading a likely top image, recording the future by URL."""
+    # pylint: disable-next=import-outside-toplevel
+    from .image_handler import prefetch_top_image
+
+    prefetched[url] = prefetch_top_image(url, downloads.session, downloads.download_dir)
+
+
+def _cancel_prefetches(prefetched: dict, keep: str | None = None) -> None:
+    """Cancel prefetched top image downloads other than keep.
+
+    A download already running cannot be cancelled; main waits for it before
+    removing the directory it writes to.
+    """
+    for url, future in prefetched.items():
+        if url != keep:
+            future.cancel()
 
-    return top_image, images
+
+def _infer_format(output: str) -> str:
+    """Infer output format from the output file extension."""
+    extension = Path(output).suffix[1:].lower()
+    return FORMATS_BY_EXTENSION.get(extension, DEFAULT_FORMAT)
 
 
 def _is_markdown_file(source: str) -> bool:
@@ -184,9 +350,9 @@ def _is_url(source: str) -> bool:
     "-f",
     "--format",
     "output_format",
-    default="pdf",
+    default=None,
     type=click.Choice(["pdf", "epub", "fb2", "md"]),
-    help="Output format (default: pdf)",
+    help="Output format (default: inferred from output extension, otherwise pdf)",
 )
 @click.option(
     "--list-formats",
@@ -212,6 +378,18 @@ def _is_url(source: str) -> bool:
     type=int,
     help="Maximum number of images to include (default: 10)",
 )
+@click.option(
+    "--max-concurrent-images",
+    default=16,
+    type=click.IntRange(min=1),
+    help="Maximum number of image downloads at once (default: 16)",
+)
+@click.option(
+    "--max-per-host",
+    default=4,
+    type=click.IntRange(min=1),
+    help="Maximum number of image downloads at once from one host (default: 4)",
+)
 @click.option(
     "--font",
     default=None,
@@ -223,6 +401,12 @@ def _is_url(source: str) -> bool:
     default=False,
     help="List available fonts and exit",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Ignore cached article and extract it again",
+)
 @click.option(
     "-v",
     "--verbose",
@@ -230,16 +414,19 @@ def _is_url(source: str) -> bool:
     default=False,
     help="Enable verbose output",
 )
-def main(  # pylint: disable=too-many-statements
+def main(  # pylint: disable=too-many-statements,too-many-arguments
     source: str | None,
     output: str | None,
-    output_format: str,
+    output_format: str | None,
     show_formats: bool = False,
     title: str | None = None,
     no_images: bool = False,
     max_images: int = 10,
+    max_concurrent_images: int = 16,
+    max_per_host: int = 4,
     font: str | None = None,
     list_fonts: bool = False,
+    no_cache: bool = False,
     verbose: bool = False,
 ) -> None:
     """Extract article from URL or convert Markdown file to various formats.
@@ -265,9 +452,10 @@ def main(  # pylint: disable=too-many-statements
         return
 
     # Validate required arguments
-    _validate_required_args(source, output)
-    assert source is not None
-    assert output is not None
+    source, output = _validate_required_args(source, output)
+
+    if output_format is None:
+        output_format = _infer_format(output)
 
     # Get renderer and validate font option
     renderer = get_renderer(output_format)
@@ -281,7 +469,8 @@ def main(  # pylint: disable=too-many-statements
     if output_format == "pdf":
         _show_font_info(font, verbose)
 
-    all_images = []
+    downloads: Optional[_ImageDownloads] = None
+    prefetched: dict = {}
 
     try:
         # Determine source type and process
@@ -306,19 +495,54 @@ def main(  # pylint: disable=too-many-statements
                 click.echo(f"Blocks: {len(document.blocks)}")
 
         elif _is_url(source):
+            # pylint: disable-next=import-outside-toplevel
+            from .extractor import extract_article
+            from .image_handler import create_session  # pylint: disable=import-outside-toplevel
+            from .progress import ProgressReporter  # pylint: disable=import-outside-toplevel
+
+            # One pooled session and one temp directory for all images of this run
+            if not no_images:
+                downloads = _ImageDownloads(
+                    max_images=max_images,
+                    session=create_session(),
+                    download_dir=Path(tempfile.mkdtemp(prefix="url_to_book_")),
+                    max_concurrent=max_concurrent_images,
+                    max_per_host=max_per_host,
+                )
+
             # Extract from URL
             if not verbose:
                 with ProgressReporter(source) as progress_reporter:
-                    # Stage 1: Extract article
+                    # Stage 1: Extract article. The likely top image starts
+                    # downloading once the page is fetched, while it is parsed.
                     progress_reporter.update_state(JobState.EXTRACTING)
-                    article = extract_article(source)
+                    article = extract_article(
+                        source,
+                        bypass_cache=no_cache,
+                        on_top_image=(
+                            partial(_prefetch_top_image, prefetched, downloads)
+                            if downloads
+                            else None
+                        ),
+                    )
+                    # The guess may differ from the top image newspaper4k picked
+                    _cancel_prefetches(prefetched, keep=article.top_image)
 
-                    # Stage 2: Download images
+                    # Stage 2: Download images (PDF fonts load meanwhile)
+                    options = RenderOptions(
+                        font_family=font, include_images=not no_images
+                    )
+                    prepare = (
+                        partial(preload_pdf, options) if output_format == "pdf" else None
+                    )
                     progress_reporter.update_state(JobState.DOWNLOADING_IMAGES)
-                    top_image, images = _download_article_images_with_progress(
-                        article, no_images, max_images, progress_reporter
+                    all_images = _download_article_images_with_progress(
+                        article,
+                        downloads,
+                        progress_reporter,
+                        prepare=prepare,
+                        top_image_future=prefetched.get(article.top_image),
                     )
-                    all_images = ([top_image] if top_image else []) + images
 
                     # Stage 3: Convert to Document
                     progress_reporter.update_state(JobState.GENERATING_PDF)
@@ -330,9 +554,6 @@ def main(  # pylint: disable=too-many-statements
                         document.metadata.title = title
 
                     # Render
-                    options = RenderOptions(
-                        font_family=font, include_images=not no_images
-                    )
                     renderer.render(document, Path(output), options)
 
                     # Stage 4: Completed
@@ -342,13 +563,10 @@ def main(  # pylint: disable=too-many-statements
                 return
 
             # Verbose mode
-            article = extract_article(source)
+            article = extract_article(source, bypass_cache=no_cache)
             _show_article_info(article, source, verbose)
 
-            top_image, images = _download_article_images(
-                article, no_images, max_images, verbose
-            )
-            all_images = ([top_image] if top_image else []) + images
+            all_images = _download_article_images(article, verbose, downloads)
 
             converter = ArticleToDocumentConverter()
             document = converter.convert(article, all_images)
@@ -378,8 +596,15 @@ def main(  # pylint: disable=too-many-statements
             traceback.print_exc()
         raise click.ClickException(f"Failed: {e}") from e
     finally:
-        if all_images:
-            cleanup_images(all_images)
+        _cancel_prefetches(prefetched)
+        if downloads is not None:
+            downloads.session.close()
+            # Prefetches that were already running still write into download_dir
+            concurrent.futures.wait(
+                [future for future in prefetched.values() if not future.cancelled()]
+            )
+            # All images live here, so one rmtree replaces unlinking them one by one
+            shutil.rmtree(downloads.download_dir, ignore_errors=True)
 
 
 if __name__ == "__main__":
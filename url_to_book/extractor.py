@@ -1,10 +1,20 @@
 import re
-from dataclasses import dataclass
-from typing import Literal, Optional
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Callable, Literal, Optional
 from urllib.parse import urljoin
 
+import requests
 from lxml import html
-from newspaper import Article, Config
+from newspaper import Article, Config, network
+from newspaper.article import ArticleDownloadState
+from newspaper.exceptions import ArticleBinaryDataException
+
+from .cache import CachedArticle, hash_content, load_cached_article, store_cached_article
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
 
 ALLOWED_TAGS = {"b", "strong", "i", "em", "u"}
 
@@ -154,47 +164,193 @@ def _find_top_image(doc: html.HtmlElement, base_url: str) -> Optional[str]:
     return None
 
 
-def download_article(url: str, timeout: int = 30) -> Article:
+def _find_page_top_image(content: bytes, base_url: str) -> Optional[str]:
+    """Find top image in raw page content with a quick lxml parse."""
+    try:
+        return _find_top_image(html.fromstring(content), base_url)
+    except Exception:
+        return None
+
+
+def fetch_page(
+    url: str,
+    timeout: int = 30,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> requests.Response:
+    """Fetch article page, optionally as a conditional GET.
+
+    Args:
+        url: URL of the article page
+        timeout: Request timeout in seconds
+        etag: ETag of a cached copy (sent as If-None-Match)
+        last_modified: Last-Modified of a cached copy (sent as If-Modified-Since)
+
+    Returns:
+        Response as received; error statuses are left for download_article
+        to report, 304 means the cached copy is still valid
+    """
+    headers = {"User-Agent": USER_AGENT}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    return requests.get(url, headers=headers, timeout=timeout)
+
+
+def _is_binary_response(response: requests.Response) -> bool:
+    """Same test as newspaper's is_binary_url, on a response already fetched."""
+    content_type = response.headers.get("Content-Type", "")
+    if content_type.startswith("application") and not (
+        "json" in content_type or "xml" in content_type
+    ):
+        return True
+    if content_type.startswith(("image", "video", "audio", "font")):
+        return True
+    if "Content-Disposition" in response.headers:
+        return True
+
+    head = response.content[:1000].decode("utf-8", errors="replace")
+    if not head or "<html" in head:
+        return False
+    printable = sum(1 for char in head if 31 < ord(char) < 128 or char in "\t\n\r")
+    return printable / len(head) < 0.6
+
+
+def _reject_failed_response(article: Article, response: requests.Response, html_text: str):
+    """Mark article download as failed the way newspaper does for its own requests.
+
+    article.parse() then raises newspaper's ArticleException, including its
+    hint about anti-bot protection (e.g. Cloudflare).
+    """
+    # pylint: disable-next=protected-access
+    protection = article._detect_protection(html_text)
+    article.download_state = ArticleDownloadState.FAILED_RESPONSE
+    if protection:
+        article.download_exception_msg = f"Website protected with {protection}, url: {article.url}"
+    else:
+        article.download_exception_msg = (
+            f"Status code {response.status_code} for url {article.url}"
+        )
+
+
+def download_article(
+    url: str, timeout: int = 30, response: Optional[requests.Response] = None
+) -> Article:
     """Download article from URL using newspaper4k.
 
     Args:
         url: URL of the article to download
         timeout: Request timeout in seconds
+        response: Already fetched page; if given, no download occurs
 
     Returns:
         Downloaded and parsed Article object from newspaper4k
     """
     config = Config()
     config.request_timeout = timeout
-    config.browser_user_agent = (
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    )
+    config.browser_user_agent = USER_AGENT
 
     article = Article(url, config=config)
-    article.download()
+    if response is None:
+        article.download()
+    elif not config.allow_binary_content and _is_binary_response(response):
+        raise ArticleBinaryDataException(f"Article is binary data: {url}")
+    elif response.status_code >= 400:
+        _reject_failed_response(article, response, response.text)
+    else:
+        article.download(input_html=network.get_html(url, config, response))
     article.parse()
 
     return article
 
 
-def extract_article(url: str, timeout: int = 30) -> ExtractedArticle:
+def extract_article(
+    url: str,
+    timeout: int = 30,
+    bypass_cache: bool = False,
+    on_top_image: Optional[Callable[[str], None]] = None,
+) -> ExtractedArticle:
     """Extract article content from URL using newspaper4k.
 
+    Results are cached on disk. A cached article is returned when the server
+    answers the conditional GET with 304 or the page content is unchanged.
+
     Args:
         url: URL of the article to extract
         timeout: Request timeout in seconds
+        bypass_cache: Ignore cached result and always re-extract
+        on_top_image: Called with the likely top image URL as soon as the page
+            is fetched, before the slow newspaper4k parse. It is a guess, the
+            returned article's top_image may differ.
 
     Returns:
         ExtractedArticle with structured content blocks
     """
-    article = download_article(url, timeout)
+    cached = None if bypass_cache else load_cached_article(url)
+    if cached:
+        response = fetch_page(url, timeout, cached.etag, cached.last_modified)
+        if response.status_code == 304:
+            return _article_from_dict(cached.article)
+    else:
+        response = fetch_page(url, timeout)
+
+    if response.status_code >= 400:
+        download_article(url, timeout, response)  # raises newspaper's error
+
+    content_hash = hash_content(response.content)
+    if cached and cached.content_hash == content_hash:
+        # Keep the new validators, or servers rotating ETags never answer 304
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if (etag, last_modified) != (cached.etag, cached.last_modified):
+            store_cached_article(url, replace(cached, etag=etag, last_modified=last_modified))
+        return _article_from_dict(cached.article)
+
+    if on_top_image is not None:
+        top_image = _find_page_top_image(response.content, url)
+        if top_image:
+            on_top_image(top_image)
+
+    result = _parse_article(download_article(url, timeout, response), url)
+    store_cached_article(
+        url,
+        CachedArticle(
+            article=asdict(result),
+            content_hash=content_hash,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        ),
+    )
+    return result
+
+
+def _article_from_dict(data: dict[str, Any]) -> ExtractedArticle:
+    """Rebuild ExtractedArticle from its cached dict form.
+
+    Lists are copied, as the cache may hand out the same dict more than once.
+    """
+    return ExtractedArticle(
+        title=data["title"],
+        content=[ContentBlock(**block) for block in data["content"]],
+        text=data["text"],
+        authors=list(data["authors"]),
+        images=list(data["images"]),
+        top_image=data["top_image"],
+        source_url=data["source_url"],
+    )
+
 
+def _parse_article(article: Article, url: str) -> ExtractedArticle:
+    """Build ExtractedArticle from parsed newspaper4k Article."""
     top_image = article.top_image
     content: list[ContentBlock] = []
 
     try:
-        doc = html.fromstring(article.html)
+        # Reuse the tree newspaper4k already built in parse(); it only adds
+        # scoring attributes, so text, tags and links are untouched.
+        doc = article.doc if article.doc is not None else html.fromstring(article.html)
         if not top_image or "32x32" in top_image or "favicon" in top_image.lower():
             top_image = _find_top_image(doc, url) or article.top_image
         content = _extract_content_blocks(doc, url)
@@ -207,7 +363,8 @@ def extract_article(url: str, timeout: int = 30) -> ExtractedArticle:
             if para:
                 content.append(ContentBlock(type="paragraph", text=para))
 
-    images = list(article.images) if article.images else []
+    # Scrapers often report the same URL more than once (srcset, thumbnails)
+    images = list(dict.fromkeys(article.images)) if article.images else []
     if top_image and top_image not in images:
         images.insert(0, top_image)
 
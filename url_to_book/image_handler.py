@@ -1,50 +1,75 @@
+import asyncio
+import contextlib
+import hashlib
 import re
 import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from io import BytesIO
 from pathlib import Path
-from typing import Optional, Callable
+from typing import AbstractSet, AsyncIterator, Callable, Optional
+from urllib.parse import urlsplit
 
 import click
 import requests
 from PIL import Image
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Plain substrings, matched against the lowercased URL without the regex engine
+AD_KEYWORDS = [
+    "tracker",
+    "pixel",
+    "avatar",
+    "button",
+    "sprite",
+    "social",
+    "share",
+    "widget",
+    "badge",
+    "promo",
+    "sponsor",
+    "doubleclick",
+    "googlesyndication",
+    "googleadservices",
+    "facebook.com/tr",
+    "analytics",
+    "counter",
+    "beacon",
+    "sber",
+    "yoomoney",
+    "boosty",
+    "patreon",
+    "paypal",
+    "donate",
+    "payment",
+]
 
+# Patterns that need word-boundary or character-class context
 AD_PATTERNS = [
     r"(?<![a-z])ad[sx]?[_\-./]",
     r"(?<![a-z])banner",
-    r"tracker",
-    r"pixel",
     r"(?<![a-z])logo",
     r"(?<![a-z])icon",
-    r"avatar",
-    r"button",
-    r"sprite",
-    r"social",
-    r"share",
-    r"widget",
-    r"badge",
-    r"promo",
-    r"sponsor",
-    r"doubleclick",
-    r"googlesyndication",
-    r"googleadservices",
-    r"facebook\.com/tr",
-    r"analytics",
     r"(?<![a-z])stat[_\-./]",
-    r"counter",
-    r"beacon",
-    r"sber",
-    r"yoomoney",
     r"yoo[-_]",
-    r"boosty",
-    r"patreon",
-    r"paypal",
-    r"donate",
-    r"payment",
     r"pay[-_.]",
 ]
 
-AD_PATTERN_RE = re.compile("|".join(AD_PATTERNS), re.IGNORECASE)
+# Literal part every AD_PATTERNS entry needs; URLs without any skip the regex
+AD_PATTERN_TOKENS = ("ad", "banner", "logo", "icon", "stat", "yoo", "pay")
+
+# Each pattern is wrapped in its own group so that a pattern containing a
+# top-level "|" cannot leak into its neighbours in the combined alternation.
+AD_PATTERN_RE = re.compile(
+    "|".join(f"(?:{pattern})" for pattern in AD_PATTERNS), re.IGNORECASE
+)
+
+IMAGE_POOL_CONNECTIONS = 8
+IMAGE_POOL_MAXSIZE = 16
+IMAGE_MAX_RETRIES = 2
+MAX_CONCURRENT_DOWNLOADS = 16
+MAX_DOWNLOADS_PER_HOST = 4  # Keeps a single CDN from throttling the whole batch
 
 MIN_WIDTH = 100
 MIN_HEIGHT = 100
@@ -58,40 +83,98 @@ class DownloadedImage:
     width: int
     height: int
     original_url: str
+    content_hash: str = ""  # blake2b of the downloaded bytes, for dedupe
+
+
+def create_session() -> requests.Session:
+    """Create HTTP session with connection pooling and keep-alive for image fetches."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=IMAGE_POOL_CONNECTIONS,
+        pool_maxsize=IMAGE_POOL_MAXSIZE,
+        max_retries=Retry(total=IMAGE_MAX_RETRIES, backoff_factor=0.2),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by all downloads so TLS handshakes are amortized across images
+_SESSION = create_session()
+
+# Top image prefetches run here, see _get_prefetch_executor(); article image
+# downloads get a pool of their own, sized to their concurrency limit
+PREFETCH_WORKERS = 2
+_PREFETCH_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+def _get_prefetch_executor() -> ThreadPoolExecutor:
+    """Get thread pool for background top image downloads, creating it on first use."""
+    global _PREFETCH_EXECUTOR  # pylint: disable=global-statement
+    if _PREFETCH_EXECUTOR is None:
+        _PREFETCH_EXECUTOR = ThreadPoolExecutor(
+            max_workers=PREFETCH_WORKERS, thread_name_prefix="url_to_book-prefetch"
+        )
+    return _PREFETCH_EXECUTOR
 
 
 def is_ad_url(url: str) -> bool:
     """Check if URL matches advertising/tracking patterns."""
-    return bool(AD_PATTERN_RE.search(url))
+    lowered = url.lower()
+    if any(keyword in lowered for keyword in AD_KEYWORDS):
+        return True
+    if not any(token in lowered for token in AD_PATTERN_TOKENS):
+        return False
+    return AD_PATTERN_RE.search(lowered) is not None
 
 
-def download_image(url: str, timeout: int = 10) -> Optional[DownloadedImage]:
-    """Download single image and return its info."""
+def download_image(
+    url: str,
+    timeout: int = 10,
+    session: Optional[requests.Session] = None,
+    download_dir: Optional[Path] = None,
+) -> Optional[DownloadedImage]:
+    """Download single image and return its info.
+
+    The session defaults to the shared one and the file goes to the system
+    temp directory unless download_dir is given.
+    """
     try:
-        response = requests.get(url, timeout=timeout, stream=True)
+        response = (session or _SESSION).get(url, timeout=timeout, stream=True)
         response.raise_for_status()
 
         content_type = response.headers.get("content-type", "")
         if not content_type.startswith("image/"):
             return None
 
-        image_data = BytesIO(response.content)
-        img = Image.open(image_data)
+        content = response.content
+        # Image.open only reads the header; pixels are decoded on convert/save
+        img = Image.open(BytesIO(content))
         width, height = img.size
 
-        suffix = Path(url.split("?")[0]).suffix or ".jpg"
-        if suffix.lower() not in [".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"]:
-            suffix = ".jpg"
+        # Plain JPEGs can be embedded as is, so skip the decode/re-encode round trip
+        keep_original = img.format == "JPEG" and img.mode in ("RGB", "L")
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            if img.mode in ("RGBA", "P"):
-                img = img.convert("RGB")
-            img.save(tmp.name, quality=85)
+        if keep_original:
+            suffix = ".jpg"
+        else:
+            suffix = Path(url.split("?")[0]).suffix or ".jpg"
+            if suffix.lower() not in [".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"]:
+                suffix = ".jpg"
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=download_dir) as tmp:
+            if keep_original:
+                tmp.write(content)
+            else:
+                if img.mode in ("RGBA", "P"):
+                    img = img.convert("RGB")
+                img.save(tmp.name, quality=85)
             return DownloadedImage(
                 path=Path(tmp.name),
                 width=width,
                 height=height,
                 original_url=url,
+                content_hash=hashlib.blake2b(content, digest_size=16).hexdigest(),
             )
     except Exception:
         return None
@@ -112,10 +195,21 @@ def filter_image(img: DownloadedImage) -> bool:
     return True
 
 
+def _accept_image(img: DownloadedImage, seen_hashes: set[str]) -> bool:
+    """Check filters and content duplicates, removing rejected image file."""
+    if filter_image(img) and img.content_hash not in seen_hashes:
+        seen_hashes.add(img.content_hash)
+        return True
+    img.path.unlink(missing_ok=True)
+    return False
+
+
 def download_top_image(
     url: str,
     verbose: bool = False,
     show_progress: bool = True,
+    session: Optional[requests.Session] = None,
+    download_dir: Optional[Path] = None,
 ) -> Optional[DownloadedImage]:
     """Download top image without URL pattern filtering."""
     if not url:
@@ -127,7 +221,7 @@ def download_top_image(
     elif verbose:
         print(f"  Downloading top image: {url[:60]}...")
 
-    img = download_image(url)
+    img = download_image(url, session=session, download_dir=download_dir)
     if img is None:
         if verbose:
             print("    Failed to download")
@@ -144,16 +238,41 @@ def download_top_image(
     return img
 
 
+def _select_candidate_urls(
+    image_urls: list[str], max_images: int, skip_urls: Optional[AbstractSet[str]] = None
+) -> list[str]:
+    """Pre-filter URLs (remove ads, duplicates and skip_urls) before downloading."""
+    limit = max_images * 2  # Take extra, as some may fail to download
+    seen = set(skip_urls) if skip_urls else set()
+    candidates: list[str] = []
+
+    for url in image_urls:
+        if len(candidates) >= limit:
+            break
+        if url in seen or is_ad_url(url):
+            continue
+        seen.add(url)
+        candidates.append(url)
+
+    return candidates
+
+
 def download_images(
     image_urls: list[str],
     max_images: int = 10,
     verbose: bool = False,
-    skip_urls: Optional[set[str]] = None,
+    skip_urls: Optional[AbstractSet[str]] = None,
     show_progress: bool = True,
     progress_callback: Optional[Callable[[int, int], None]] = None,
+    skip_hashes: Optional[set[str]] = None,
+    session: Optional[requests.Session] = None,
+    download_dir: Optional[Path] = None,
 ) -> list[DownloadedImage]:
     """Download and filter images from URLs.
 
+    Images with the same content as an earlier one are dropped, even when
+    served from different URLs.
+
     Args:
         image_urls: List of image URLs to download
         max_images: Maximum number of images to download
@@ -161,17 +280,16 @@ def download_images(
         skip_urls: Set of URLs to skip
         show_progress: Show progress bar (click.progressbar)
         progress_callback: Callback function for progress updates (downloaded, total)
+        skip_hashes: Content hashes of images already downloaded elsewhere
+        session: HTTP session to download with (default: shared module session)
+        download_dir: Directory for downloaded files (default: system temp directory)
 
     Returns:
         List of successfully downloaded images
     """
     downloaded: list[DownloadedImage] = []
-    skip_urls = skip_urls or set()
-
-    # Pre-filter URLs (remove ads and skip_urls)
-    urls_to_process = [
-        url for url in image_urls if url not in skip_urls and not is_ad_url(url)
-    ][: max_images * 2]  # Take extra, as some may fail to download
+    seen_hashes = set(skip_hashes) if skip_hashes else set()
+    urls_to_process = _select_candidate_urls(image_urls, max_images, skip_urls)
 
     total_to_process = min(len(urls_to_process), max_images)
 
@@ -181,12 +299,10 @@ def download_images(
             if len(downloaded) >= max_images:
                 break
 
-            img = download_image(url)
-            if img and filter_image(img):
+            img = download_image(url, session=session, download_dir=download_dir)
+            if img and _accept_image(img, seen_hashes):
                 downloaded.append(img)
                 progress_callback(len(downloaded), total_to_process)
-            elif img:
-                img.path.unlink(missing_ok=True)
 
     # Progress bar mode
     elif show_progress and not verbose:
@@ -200,11 +316,9 @@ def download_images(
                 if len(downloaded) >= max_images:
                     break
 
-                img = download_image(url)
-                if img and filter_image(img):
+                img = download_image(url, session=session, download_dir=download_dir)
+                if img and _accept_image(img, seen_hashes):
                     downloaded.append(img)
-                elif img:
-                    img.path.unlink(missing_ok=True)
 
     # Verbose mode
     else:
@@ -215,7 +329,7 @@ def download_images(
             if verbose:
                 print(f"  Downloading: {url[:60]}...")
 
-            img = download_image(url)
+            img = download_image(url, session=session, download_dir=download_dir)
             if img is None:
                 if verbose:
                     print("    Failed to download")
@@ -227,13 +341,231 @@ def download_images(
                 img.path.unlink(missing_ok=True)
                 continue
 
+            if img.content_hash in seen_hashes:
+                if verbose:
+                    print("    Duplicate of an earlier image")
+                img.path.unlink(missing_ok=True)
+                continue
+
             if verbose:
                 print(f"    OK ({img.width}x{img.height})")
+            seen_hashes.add(img.content_hash)
             downloaded.append(img)
 
     return downloaded
 
 
+def prefetch_top_image(
+    url: str,
+    session: Optional[requests.Session] = None,
+    download_dir: Optional[Path] = None,
+) -> "Future[Optional[DownloadedImage]]":
+    """Start downloading top image in the background (no console output).
+
+    Returns:
+        Future with the result of download_top_image
+    """
+    return _get_prefetch_executor().submit(
+        download_top_image,
+        url,
+        verbose=False,
+        show_progress=False,
+        session=session,
+        download_dir=download_dir,
+    )
+
+
+async def download_top_image_async(
+    url: str,
+    session: Optional[requests.Session] = None,
+    download_dir: Optional[Path] = None,
+) -> Optional[DownloadedImage]:
+    """Download top image without blocking the event loop (no console output)."""
+    return await asyncio.wrap_future(prefetch_top_image(url, session, download_dir))
+
+
+def _unlink_result(future: "Future[Optional[DownloadedImage]]") -> None:
+    """Done-callback removing the file of a download nobody will collect."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    img = future.result()
+    if img is not None:
+        img.path.unlink(missing_ok=True)
+
+
+async def _download_stream(
+    urls: list[str],
+    max_concurrent: int,
+    session: Optional[requests.Session] = None,
+    download_dir: Optional[Path] = None,
+    max_per_host: int = MAX_DOWNLOADS_PER_HOST,
+) -> AsyncIterator[tuple[int, Optional[DownloadedImage]]]:
+    """Download URLs concurrently, yielding (index, image) in completion order.
+
+    The image is None for URLs that failed to download or did not pass
+    filter_image. At most max_concurrent downloads run at once, and at most
+    max_per_host of them against the same host.
+
+    Callers that stop early must aclose() the generator: that cancels the
+    pending downloads and removes files no one has received.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+    host_semaphores: dict[str, asyncio.Semaphore] = {}
+    yielded: set[int] = set()
+    # One worker per download slot, so max_concurrent is the real limit
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(max_concurrent, len(urls))),
+        thread_name_prefix="url_to_book-download",
+    )
+
+    async def download_one(index: int, url: str) -> tuple[int, Optional[DownloadedImage]]:
+        host = urlsplit(url).netloc
+        if host not in host_semaphores:
+            host_semaphores[host] = asyncio.Semaphore(max_per_host)
+        # Host slot first, so a task waiting on a busy host holds no global slot
+        async with host_semaphores[host], semaphore:
+            future = executor.submit(
+                download_image, url, session=session, download_dir=download_dir
+            )
+            try:
+                img = await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                # A worker thread cannot be stopped; drop its file once done
+                future.add_done_callback(_unlink_result)
+                raise
+        if img is not None and not filter_image(img):
+            img.path.unlink(missing_ok=True)
+            img = None
+        return index, img
+
+    tasks = [asyncio.ensure_future(download_one(index, url)) for index, url in enumerate(urls)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, img = await next_done
+            yielded.add(index)
+            yield index, img
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled() and task.exception() is None:
+                index, img = task.result()
+                if index not in yielded and img is not None:
+                    img.path.unlink(missing_ok=True)
+        # Running downloads finish in the background, see download_one
+        executor.shutdown(wait=False)
+
+
+async def iter_images_async(
+    image_urls: list[str],
+    max_images: int = 10,
+    skip_urls: Optional[AbstractSet[str]] = None,
+    max_concurrent: int = MAX_CONCURRENT_DOWNLOADS,
+    session: Optional[requests.Session] = None,
+    download_dir: Optional[Path] = None,
+    max_per_host: int = MAX_DOWNLOADS_PER_HOST,
+) -> AsyncIterator[tuple[int, DownloadedImage]]:
+    """Download images concurrently, yielding each one as soon as it is ready.
+
+    Images arrive in completion order, paired with their index among the
+    candidate URLs so callers can restore document order. Every candidate that
+    passes filter_image is yielded (up to max_images * 2); trimming to
+    max_images and content dedupe are left to the caller, which also owns
+    the yielded files. Callers that stop early must aclose() the iterator
+    (e.g. with contextlib.aclosing) to cancel the remaining downloads.
+
+    Args:
+        image_urls: List of image URLs to download
+        max_images: Maximum number of images wanted (bounds the candidates)
+        skip_urls: Set of URLs to skip
+        max_concurrent: Maximum number of downloads in flight
+        session: HTTP session to download with (default: shared module session)
+        download_dir: Directory for downloaded files (default: system temp directory)
+        max_per_host: Maximum number of downloads in flight per host
+
+    Yields:
+        Tuples of (candidate index, downloaded image)
+    """
+    urls_to_process = _select_candidate_urls(image_urls, max_images, skip_urls)
+    async with contextlib.aclosing(
+        _download_stream(urls_to_process, max_concurrent, session, download_dir, max_per_host)
+    ) as stream:
+        async for index, img in stream:
+            if img is not None:
+                yield index, img
+
+
+async def download_images_async(
+    image_urls: list[str],
+    max_images: int = 10,
+    skip_urls: Optional[AbstractSet[str]] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    skip_hashes: Optional[set[str]] = None,
+    session: Optional[requests.Session] = None,
+    download_dir: Optional[Path] = None,
+    max_concurrent: int = MAX_CONCURRENT_DOWNLOADS,
+    max_per_host: int = MAX_DOWNLOADS_PER_HOST,
+) -> list[DownloadedImage]:
+    """Download and filter images concurrently.
+
+    Collects the same stream as iter_images_async into a list. The result keeps the original URL
+    order, so images land in the same places as with download_images. Like
+    download_images, it stops once max_images images are accepted, cancelling
+    the downloads still pending.
+
+    Args:
+        image_urls: List of image URLs to download
+        max_images: Maximum number of images to download
+        skip_urls: Set of URLs to skip
+        progress_callback: Callback function for progress updates (downloaded, total)
+        skip_hashes: Content hashes of images already downloaded elsewhere
+        session: HTTP session to download with (default: shared module session)
+        download_dir: Directory for downloaded files (default: system temp directory)
+        max_concurrent: Maximum number of downloads in flight
+        max_per_host: Maximum number of downloads in flight per host
+
+    Returns:
+        List of successfully downloaded images
+    """
+    urls_to_process = _select_candidate_urls(image_urls, max_images, skip_urls)
+    total_to_process = min(len(urls_to_process), max_images)
+    finished = 0
+    # Downloads completed ahead of the first candidate still in flight
+    ahead: dict[int, Optional[DownloadedImage]] = {}
+    next_index = 0
+    downloaded: list[DownloadedImage] = []
+    seen_hashes = set(skip_hashes) if skip_hashes else set()
+
+    async with contextlib.aclosing(
+        _download_stream(urls_to_process, max_concurrent, session, download_dir, max_per_host)
+    ) as stream:
+        async for index, img in stream:
+            if img is not None:
+                finished += 1
+                if progress_callback and finished <= total_to_process:
+                    progress_callback(finished, total_to_process)
+
+            # Accept in URL order, so the result matches download_images;
+            # once max_images are accepted the rest is not needed.
+            ahead[index] = img
+            while next_index in ahead and len(downloaded) < max_images:
+                candidate = ahead.pop(next_index)
+                next_index += 1
+                if candidate is None:
+                    continue
+                if candidate.content_hash in seen_hashes:
+                    candidate.path.unlink(missing_ok=True)
+                    continue
+                seen_hashes.add(candidate.content_hash)
+                downloaded.append(candidate)
+
+            if len(downloaded) >= max_images:
+                break
+
+    cleanup_images([img for img in ahead.values() if img is not None])
+    return downloaded
+
+
 def cleanup_images(images: list[DownloadedImage]) -> None:
     """Remove temporary image files."""
     for img in images:
@@ -17,7 +17,7 @@ from .document import (
     ParagraphBlock,
 )
 from .markdown_parser import MarkdownToDocumentConverter
-from .registry import get_renderer, list_formats, registry
+from .registry import get_renderer, list_formats, registry, render_documents
 
 # Import renderers to trigger registration
 from . import epub_renderer  # noqa: F401
@@ -30,6 +30,7 @@ from .pdf_renderer import (
     find_available_fonts,
     get_default_font,
     get_font_families,
+    preload_pdf,
     FontFamily,
 )
 
@@ -56,9 +57,11 @@ __all__ = [
     "registry",
     "get_renderer",
     "list_formats",
+    "render_documents",
     # Font utilities
     "find_available_fonts",
     "get_default_font",
     "get_font_families",
+    "preload_pdf",
     "FontFamily",
 ]
@@ -1,8 +1,7 @@
 import re
-from typing import Optional
+from collections import deque
+from typing import TYPE_CHECKING, Optional
 
-from ..extractor import ExtractedArticle
-from ..image_handler import DownloadedImage
 from .document import (
     Document,
     DocumentMetadata,
@@ -13,14 +12,22 @@ from .document import (
     ParagraphBlock,
 )
 
+# Only needed for annotations; importing extractor at runtime would pull in
+# newspaper4k (and nltk) for every user of the renderers package.
+if TYPE_CHECKING:
+    from ..extractor import ExtractedArticle
+    from ..image_handler import DownloadedImage
+
+INLINE_TAG_RE = re.compile(r'<(/?)([biu])>|<a href="([^"]+)">|</a>', re.IGNORECASE)
+
 
 class ArticleToDocumentConverter:
     """Converts ExtractedArticle to universal Document format."""
 
     def convert(
         self,
-        article: ExtractedArticle,
-        images: Optional[list[DownloadedImage]] = None,
+        article: "ExtractedArticle",
+        images: Optional[list["DownloadedImage"]] = None,
     ) -> Document:
         """Convert article to Document.
 
@@ -38,11 +45,11 @@ class ArticleToDocumentConverter:
         )
 
         blocks = []
-        images_to_insert = list(images) if images else []
+        images_to_insert = deque(images) if images else deque()
 
         # Insert first image at top if available
         if images_to_insert:
-            top_img = images_to_insert.pop(0)
+            top_img = images_to_insert.popleft()
             blocks.append(
                 ImageBlock(
                     path=top_img.path,
@@ -81,7 +88,7 @@ class ArticleToDocumentConverter:
                     and image_interval > 0
                     and paragraph_idx % image_interval == 0
                 ):
-                    img = images_to_insert.pop(0)
+                    img = images_to_insert.popleft()
                     blocks.append(
                         ImageBlock(
                             path=img.path,
@@ -109,22 +116,21 @@ class ArticleToDocumentConverter:
 
         Handles <b>, <i>, <u>, and <a href="..."> tags.
         """
-        tag_pattern = re.compile(
-            r'<(/?)([biu])>|<a href="([^"]+)">|</a>', re.IGNORECASE
-        )
+        # Most paragraphs have no markup at all
+        if "<" not in html_text:
+            return [InlineElement(type=InlineType.TEXT, content=html_text)] if html_text else []
 
         elements: list[InlineElement] = []
         last_end = 0
-        bold = False
-        italic = False
+        styles = {"b": False, "i": False, "u": False}
         link_url: Optional[str] = None
 
         def get_current_type() -> InlineType:
             if link_url:
                 return InlineType.LINK
-            if bold:
+            if styles["b"]:
                 return InlineType.BOLD
-            if italic:
+            if styles["i"]:
                 return InlineType.ITALIC
             return InlineType.TEXT
 
@@ -136,27 +142,17 @@ class ArticleToDocumentConverter:
                 InlineElement(type=current_type, content=text, url=link_url)
             )
 
-        for match in tag_pattern.finditer(html_text):
+        for match in INLINE_TAG_RE.finditer(html_text):
             # Add text before this tag
             if match.start() > last_end:
                 add_text(html_text[last_end : match.start()])
 
-            if match.group(0) == "</a>":
-                link_url = None
-            elif match.group(3):  # <a href="...">
-                link_url = match.group(3)
-            elif match.group(1) == "/":  # Closing tag
-                tag = match.group(2).lower()
-                if tag == "b":
-                    bold = False
-                elif tag == "i":
-                    italic = False
-            else:  # Opening tag
-                tag = match.group(2).lower()
-                if tag == "b":
-                    bold = True
-                elif tag == "i":
-                    italic = True
+            # lastindex tells the alternatives apart: 2 for <b>/<i>/<u> (open or
+            # close), 3 for <a href="...">, None for </a>
+            if match.lastindex == 2:
+                styles[match[2].lower()] = not match[1]
+            else:
+                link_url = match[3]
 
             last_end = match.end()
 
@@ -1,9 +1,17 @@
+import hashlib
+import inspect
+import json
+import os
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import groupby
 from pathlib import Path
 from typing import Optional
 
 from fpdf import FPDF
+from fpdf.enums import TextEmphasis
 
+from ..cache import get_cache_root, write_cache_file
 from .base import BaseRenderer, RenderError, RenderOptions
 from .document import (
     Document,
@@ -248,17 +256,125 @@ FONT_FAMILIES = {
     ),
 }
 
+# add_font(variations=...) only exists in newer fpdf2 releases
+_FPDF_SUPPORTS_VARIATIONS = "variations" in inspect.signature(FPDF.add_font).parameters
+
 LINK_COLOR = (0, 0, 180)
 
+INLINE_FONT_STYLES = {
+    InlineType.BOLD: "B",
+    InlineType.ITALIC: "I",
+}
 
-def find_font(paths: list[str]) -> Optional[str]:
-    """Find first existing font from list of paths."""
+
+@lru_cache(maxsize=None)
+def _find_first_existing(paths: tuple[str, ...]) -> Optional[str]:
     for path in paths:
-        if Path(path).exists():
+        if os.path.exists(path):
             return path
     return None
 
 
+def find_font(paths: list[str]) -> Optional[str]:
+    """Find first existing font from list of paths (cached per process)."""
+    return _find_first_existing(tuple(paths))
+
+
+def _font_paths_by_dir() -> dict[str, list[str]]:
+    """Group all candidate font paths of FONT_FAMILIES by directory."""
+    by_dir: dict[str, list[str]] = {}
+    for family in FONT_FAMILIES.values():
+        for paths in (family.regular, family.bold, family.italic, family.bold_italic):
+            for path in paths:
+                by_dir.setdefault(os.path.dirname(path), []).append(path)
+    return by_dir
+
+
+def _existing_font_files() -> set[str]:
+    """Find which candidate font files exist, listing each directory once."""
+    existing: set[str] = set()
+    for directory, paths in _font_paths_by_dir().items():
+        try:
+            with os.scandir(directory) as entries:
+                names = {entry.name for entry in entries if entry.is_file()}
+        except FileNotFoundError:
+            continue
+        except OSError:
+            # Directory can't be listed (e.g. permissions), check files one by one
+            existing.update(path for path in paths if find_font([path]))
+            continue
+        existing.update(path for path in paths if os.path.basename(path) in names)
+    return existing
+
+
+# Bump when the layout of fonts.json changes (e.g. the per-family tuple)
+FONT_CACHE_VERSION = 1
+
+
+def _font_cache_key() -> str:
+    """Fingerprint FONT_FAMILIES and the font directories they point to.
+
+    Directory mtimes change when font files are added or removed, so one stat
+    per directory is enough to tell whether cached resolutions still hold.
+    """
+    parts = [repr(FONT_FAMILIES)]
+    for parent in sorted(_font_paths_by_dir()):
+        try:
+            parts.append(f"{parent}:{os.stat(parent).st_mtime_ns}")
+        except OSError:
+            parts.append(f"{parent}:-")
+    return hashlib.blake2b("\n".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _load_font_cache(key: str) -> Optional[dict[str, tuple[Optional[str], ...]]]:
+    """Load resolved font files saved by an earlier run, if still valid."""
+    try:
+        data = json.loads((get_cache_root() / "fonts.json").read_bytes())
+        if data.get("version") != FONT_CACHE_VERSION or data["key"] != key:
+            return None
+        return {name: tuple(files) for name, files in data["fonts"].items()}
+    except Exception:
+        return None
+
+
+def _save_font_cache(key: str, fonts: dict[str, tuple[Optional[str], ...]]) -> None:
+    """Save resolved font files. Failures are ignored, the cache is best-effort."""
+    data = {"version": FONT_CACHE_VERSION, "key": key, "fonts": fonts}
+    try:
+        write_cache_file(get_cache_root() / "fonts.json", json.dumps(data))
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=1)
+def _resolve_all_font_files() -> dict[str, tuple[Optional[str], ...]]:
+    """Resolve style files of every family, reusing the on-disk cache if valid."""
+    key = _font_cache_key()
+    fonts = _load_font_cache(key)
+    if fonts is None or fonts.keys() != FONT_FAMILIES.keys():
+        existing = _existing_font_files()
+
+        def first_existing(paths: list[str]) -> Optional[str]:
+            return next((path for path in paths if path in existing), None)
+
+        fonts = {
+            name: (
+                first_existing(family.regular),
+                first_existing(family.bold),
+                first_existing(family.italic),
+                first_existing(family.bold_italic),
+            )
+            for name, family in FONT_FAMILIES.items()
+        }
+        _save_font_cache(key, fonts)
+    return fonts
+
+
+def _resolve_font_files(name: str) -> tuple[Optional[str], ...]:
+    """Resolve (regular, bold, italic, bold_italic) font files of a family."""
+    return _resolve_all_font_files()[name]
+
+
 def is_variable_font(font_path: str) -> bool:
     """Check if font is a variable font by filename."""
     return "[wght]" in font_path
@@ -269,18 +385,20 @@ def get_font_families() -> dict[str, FontFamily]:
     return FONT_FAMILIES
 
 
+@lru_cache(maxsize=1)
+def _scan_available_fonts() -> tuple[str, ...]:
+    """Find installed font families (cached per process and on disk)."""
+    return tuple(name for name, files in _resolve_all_font_files().items() if files[0])
+
+
 def find_available_fonts() -> list[str]:
     """Find all available font families in the system."""
-    available = []
-    for name, family in FONT_FAMILIES.items():
-        if find_font(family.regular):
-            available.append(name)
-    return available
+    return list(_scan_available_fonts())
 
 
 def get_default_font() -> str:
     """Get the first available font family name."""
-    available = find_available_fonts()
+    available = _scan_available_fonts()
     if not available:
         raise RuntimeError(
             "No Unicode fonts found. Please install one of the following:\n"
@@ -307,7 +425,7 @@ def get_font_family(name: Optional[str] = None) -> FontFamily:
         )
 
     family = FONT_FAMILIES[name]
-    if not find_font(family.regular):
+    if name not in _scan_available_fonts():
         raise RuntimeError(
             f"Font family '{name}' ({family.display_name}) is not installed.\n"
             f"Please install it or choose another font using --list-fonts."
@@ -320,17 +438,18 @@ class ArticlePDF(FPDF):
     """Custom PDF class with Unicode font support."""
 
     def __init__(self, font_family_name: Optional[str] = None):
+        self._font_name = "UnicodeFont"
+        # Style -> (font path, weight) of fonts not parsed yet, see set_font
+        self._pending_fonts: dict[str, tuple[str, int]] = {}
         super().__init__()
         self._custom_font_family = get_font_family(font_family_name)
-        self._font_name = "UnicodeFont"
         self._setup_fonts()
 
     def _setup_fonts(self):
         """Setup Unicode fonts for Cyrillic support."""
-        regular_font = find_font(self._custom_font_family.regular)
-        bold_font = find_font(self._custom_font_family.bold)
-        italic_font = find_font(self._custom_font_family.italic)
-        bold_italic_font = find_font(self._custom_font_family.bold_italic)
+        regular_font, bold_font, italic_font, bold_italic_font = _resolve_font_files(
+            self._custom_font_family.name
+        )
 
         if not regular_font:
             raise RuntimeError(
@@ -341,36 +460,58 @@ class ArticlePDF(FPDF):
             )
 
         self._add_font_with_variations(regular_font, "", FONT_WEIGHTS["regular"])
-        if bold_font:
-            self._add_font_with_variations(bold_font, "B", FONT_WEIGHTS["bold"])
-        if italic_font:
-            self._add_font_with_variations(italic_font, "I", FONT_WEIGHTS["italic"])
-        if bold_italic_font:
-            self._add_font_with_variations(
-                bold_italic_font, "BI", FONT_WEIGHTS["bold_italic"]
-            )
+
+        # Parsing a TTF takes tens of milliseconds, so other styles are only
+        # loaded once used: many articles have no italics at all.
+        for style, font_path, weight in (
+            ("B", bold_font, FONT_WEIGHTS["bold"]),
+            ("I", italic_font, FONT_WEIGHTS["italic"]),
+            ("BI", bold_italic_font, FONT_WEIGHTS["bold_italic"]),
+        ):
+            if font_path:
+                self._pending_fonts[style] = (font_path, weight)
 
         self.set_font(self._font_name, size=12)
 
+    def load_font_style(self, style: str) -> None:
+        """Parse and register the font file of style ("B", "I" or "BI") if not done yet."""
+        pending = self._pending_fonts.pop(style, None)
+        if pending:
+            self._add_font_with_variations(pending[0], style, pending[1])
+
+    def set_font(self, family=None, style="", size=0):
+        # Normalized like FPDF.set_font: case-insensitive family, an empty
+        # family keeps the current one, underline/strikethrough need no font file
+        if (family or self.font_family).lower() == self._font_name.lower():
+            if isinstance(style, TextEmphasis):
+                style = style.style
+            try:
+                self.load_font_style("".join(sorted(set(style.upper()) - {"U", "S"})))
+            except RuntimeError as e:
+                # Raised mid-render, outside the font setup that render() wraps
+                raise RenderError(str(e)) from e
+        super().set_font(family, style, size)
+
     def _add_font_with_variations(self, font_path: str, style: str, weight: int):
-        """Add font with variable font support."""
+        """Add font, pinning the weight of variable fonts if fpdf2 supports it."""
         try:
-            if is_variable_font(font_path):
-                self.add_font(
-                    self._font_name,
-                    style,  # type: ignore[arg-type]
-                    font_path,
-                    variations={"wght": weight},  # pyright: ignore[reportCallIssue]
-                )
-            else:
-                self.add_font(self._font_name, style, font_path)  # type: ignore[arg-type]
-        except (TypeError, AttributeError):
-            try:
-                self.add_font(self._font_name, style, font_path)  # type: ignore[arg-type]
-            except Exception as fallback_error:
-                raise RuntimeError(
-                    f"Failed to add font {font_path} (style: {style}): {fallback_error}"
-                ) from fallback_error
+            if _FPDF_SUPPORTS_VARIATIONS and is_variable_font(font_path):
+                try:
+                    self.add_font(
+                        self._font_name,
+                        style,  # type: ignore[arg-type]
+                        font_path,
+                        variations={"wght": weight},  # pyright: ignore[reportCallIssue]
+                    )
+                    return
+                except AttributeError:
+                    pass  # Named like a variable font, but has no fvar table
+
+            self.add_font(self._font_name, style, font_path)  # type: ignore[arg-type]
+        except Exception as error:
+            raise RuntimeError(
+                f"Failed to add font {font_path} (style: {style}): {error}"
+            ) from error
 
     def header(self):
         pass
@@ -383,6 +524,21 @@ class ArticlePDF(FPDF):
         self.set_text_color(0, 0, 0)
 
 
+def preload_pdf(options: RenderOptions) -> None:
+    """Load fonts for the next PDF render ahead of time.
+
+    Stores a ready ArticlePDF in options.extra, which PDFRenderer.render picks up,
+    so font loading can run in a thread while images are still downloading.
+    Font errors are left for render to report.
+    """
+    try:
+        pdf = ArticlePDF(font_family_name=options.font_family)
+        pdf.load_font_style("B")  # The title is always bold
+        options.extra["pdf"] = pdf
+    except (RuntimeError, ValueError):
+        pass
+
+
 @registry.register
 class PDFRenderer(BaseRenderer):
     """Renders Document to PDF format."""
@@ -408,7 +564,9 @@ class PDFRenderer(BaseRenderer):
             output_path = output_path.with_suffix(".pdf")
 
         try:
-            pdf = ArticlePDF(font_family_name=options.font_family)
+            pdf = options.extra.pop("pdf", None) or ArticlePDF(
+                font_family_name=options.font_family
+            )
         except (RuntimeError, ValueError) as e:
             raise RenderError(str(e)) from e
 
@@ -416,6 +574,7 @@ class PDFRenderer(BaseRenderer):
         pdf.add_page()
 
         effective_width = pdf.w - pdf.l_margin - pdf.r_margin
+        page_bottom = pdf.h - pdf.b_margin
 
         # Title
         pdf.set_font(pdf._font_name, "B", 18)
@@ -456,7 +615,7 @@ class PDFRenderer(BaseRenderer):
 
             elif isinstance(block, ImageBlock):
                 if options.include_images:
-                    self._insert_image(pdf, block, effective_width)
+                    self._insert_image(pdf, block, effective_width, page_bottom)
 
             elif isinstance(block, HorizontalRuleBlock):
                 pdf.ln(5)
@@ -476,28 +635,39 @@ class PDFRenderer(BaseRenderer):
     def _write_inline_elements(  # pylint: disable=protected-access
         self, pdf: ArticlePDF, elements: list[InlineElement]
     ):
-        """Write inline elements with formatting to PDF."""
-        for elem in elements:
-            if elem.type == InlineType.BOLD:
-                pdf.set_font(pdf._font_name, "B", 12)
-            elif elem.type == InlineType.ITALIC:
-                pdf.set_font(pdf._font_name, "I", 12)
+        """Write inline elements with formatting to PDF.
+
+        Consecutive elements with the same formatting are written in one call,
+        and the font and text color are only switched when they change.
+        """
+        current_style = None
+        current_color = (0, 0, 0)
+        for (elem_type, url), run in groupby(elements, key=lambda elem: (elem.type, elem.url)):
+            style = INLINE_FONT_STYLES.get(elem_type, "")
+            if style != current_style:
+                pdf.set_font(pdf._font_name, style, 12)
+                current_style = style
+
+            is_link = elem_type == InlineType.LINK and url
+            color = LINK_COLOR if is_link else (0, 0, 0)
+            if color != current_color:
+                pdf.set_text_color(*color)
+                current_color = color
+
+            text = "".join(elem.content for elem in run)
+            if is_link:
+                pdf.write(7, text, url)
             else:
-                pdf.set_font(pdf._font_name, "", 12)
-
-            if elem.type == InlineType.LINK and elem.url:
-                pdf.set_text_color(*LINK_COLOR)
-                pdf.write(7, elem.content, elem.url)
-                pdf.set_text_color(0, 0, 0)
-            else:
-                pdf.write(7, elem.content)
+                pdf.write(7, text)
 
+        if current_color != (0, 0, 0):
+            pdf.set_text_color(0, 0, 0)
         pdf.ln()
 
     def _insert_image(
-        self, pdf: ArticlePDF, block: ImageBlock, max_width: float
+        self, pdf: ArticlePDF, block: ImageBlock, max_width: float, page_bottom: float
     ) -> None:
-        """Insert image into PDF."""
+        """Insert image into PDF, starting a new page if it would cross page_bottom."""
         if not block.path or not block.path.exists():
             return
 
@@ -509,7 +679,7 @@ class PDFRenderer(BaseRenderer):
             scale = img_width / width
             img_height = height * scale
 
-            if pdf.get_y() + img_height > pdf.h - pdf.b_margin:
+            if pdf.get_y() + img_height > page_bottom:
                 pdf.add_page()
 
             x = pdf.l_margin + (max_width - img_width) / 2
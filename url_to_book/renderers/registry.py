@@ -1,6 +1,11 @@
-from typing import Type, TypeVar
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Type, TypeVar
 
-from .base import BaseRenderer
+from .base import BaseRenderer, RenderOptions
+from .document import Document
 
 T = TypeVar("T", bound=BaseRenderer)
 
@@ -45,11 +50,60 @@ class RendererRegistry:
 registry = RendererRegistry()
 
 
+@lru_cache(maxsize=None)
 def get_renderer(format_name: str, **kwargs) -> BaseRenderer:
-    """Create renderer instance by format name."""
+    """Get renderer instance by format name.
+
+    Renderers are stateless, so instances are cached and shared between calls.
+    """
     return registry.create(format_name, **kwargs)
 
 
 def list_formats() -> list[str]:
     """List all registered format names."""
     return registry.list_formats()
+
+
+def _render_target(
+    document: Document,
+    output_path: Path,
+    format_name: str,
+    options: Optional[RenderOptions],
+) -> Path:
+    return get_renderer(format_name).render(document, output_path, options)
+
+
+def render_documents(
+    document: Document,
+    targets: list[tuple[Path, str]],
+    options: Optional[RenderOptions] = None,
+    max_workers: Optional[int] = None,
+) -> list[Path]:
+    """Render one document to several formats in parallel.
+
+    Each format is rendered in its own process, so CPU-bound renderers (PDF)
+    do not hold up the others. The document and options are pickled for the
+    workers, so options.extra must only contain picklable values. Workers are
+    spawned rather than forked: the caller may have live threads (e.g. image
+    downloads), and forking those can deadlock.
+
+    Args:
+        document: Document to render
+        targets: List of (output_path, format_name) pairs
+        options: Render options shared by all targets
+        max_workers: Maximum number of worker processes (default: one per target)
+
+    Returns:
+        Output paths in the same order as targets
+    """
+    if len(targets) <= 1:
+        return [_render_target(document, path, fmt, options) for path, fmt in targets]
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers or len(targets), mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = [
+            executor.submit(_render_target, document, path, fmt, options)
+            for path, fmt in targets
+        ]
+        return [future.result() for future in futures]